@@ -0,0 +1,215 @@
+'''
+Parallel encoder and decoder for Adrien's Signs style bit ciphers (see "Modular Arithmetic/Adrien's_Signs.py").
+
+The cipher sends every plaintext bit as one number mod p:
+    bit 1  ->   a^e mod p         (a quadratic residue, because a is one)
+    bit 0  ->  -a^e mod p         (a non-residue, because p ≡ 3 mod 4 makes -1 a non-residue)
+with a fresh random e for every bit. Decoding only needs the Legendre symbol of each number.
+
+encrypt_flag() and decrypt_flag() do this one bit at a time and keep the ciphertext as a Python list, which is
+fine for a 28-byte flag but not for load testing a decoder with tens of millions of bits. This script:
+    - cuts the plaintext into chunks of --chunk-bytes and encrypts/decrypts the chunks in worker processes
+    - seeds the random numbers of chunk i with random.Random(f"{seed}/{i}"), so the same seed gives the same
+      ciphertext whatever the number of workers
+    - writes the ciphertext as an IntArrayFile (fixed-width little-endian integers, see IntArrayFile.py) instead
+      of a list repr, and reads it back chunk by chunk through mmap, so neither side ever holds the whole
+      ciphertext in memory
+    - does the modular exponentiations of a chunk with NumPy (ModularArrays.py) when NumPy is installed and
+      p < 2^51; the random exponents are drawn the same way, so the ciphertext is the same with or without it
+
+The ciphertext file holds one number per plaintext bit, in order, with p as the file's modulus (a is not needed
+to decrypt). The challenge's own ciphertext can be converted and decrypted too:
+    python IntArrayFile.py convert "Modular Arithmetic/output.txt" ct.bin --modulus 1007621497415251
+    python AdriensSignsPipeline.py decrypt ct.bin
+
+Usage:
+    python AdriensSignsPipeline.py encrypt --bits 10000000 --seed 1 -o ct.bin        # random plaintext
+    python AdriensSignsPipeline.py encrypt --input message.txt -o ct.bin
+    python AdriensSignsPipeline.py decrypt ct.bin -o message.out
+    python AdriensSignsPipeline.py check --bits 100000                              # round trip + timings
+'''
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+from multiprocessing import Pool
+
+import cryptocodes
+from IntArrayFile import IntArrayFile, IntArrayWriter
+
+DEFAULT_A = cryptocodes.AdriensSigns.a
+DEFAULT_P = cryptocodes.AdriensSigns.p
+
+try:
+    ModularArrays = cryptocodes.load_module("ModularArrays")
+    import numpy as np
+except ImportError:
+    ModularArrays = None
+
+
+def _vectorized(p: int, width: int) -> bool:
+    return ModularArrays is not None and width == 8 and p < ModularArrays.MAX_MODULUS
+
+
+def pack(values: list, width: int) -> bytes:
+    if width == 8:
+        packed = array("Q", values)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        return packed.tobytes()
+    return b"".join(v.to_bytes(width, "little") for v in values)
+
+def unpack(data: bytes, width: int) -> list:
+    if width == 8:
+        values = array("Q")
+        values.frombytes(data)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tolist()
+    return [int.from_bytes(data[i:i + width], "little") for i in range(0, len(data), width)]
+
+
+# --- work done in the worker processes (module-level so it can be pickled) ---
+
+def encrypt_chunk(job: tuple) -> bytes:
+    '''Encrypt plaintext chunk number `index`; its random numbers only depend on (seed, index).'''
+    index, data, seed, a, p, width = job
+    randint = random.Random(f"{seed}/{index}").randint
+    if _vectorized(p, width):
+        exponents = np.array([randint(1, p) for _ in range(8 * len(data))], dtype=np.uint64)
+        n = ModularArrays.mod_exp_array(a, exponents, p)
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8)).astype(bool)
+        return np.where(bits, n, np.uint64(p) - n).astype("<u8").tobytes()
+
+    values = []
+    for byte in data:
+        for shift in range(7, -1, -1):
+            n = pow(a, randint(1, p), p)
+            values.append(n if (byte >> shift) & 1 else -n % p)
+    return pack(values, width)
+
+def decrypt_chunk(job: tuple) -> bytes:
+    data, p, width = job
+    if _vectorized(p, width):
+        symbols = ModularArrays.legendre_symbol_array(np.frombuffer(data, dtype="<u8"), p)
+        ones = symbols == 1
+        if not (ones | (symbols == p - 1)).all():
+            raise ValueError("Unexpected value in Legendre test.")
+        return np.packbits(ones).tobytes()
+
+    bits = []
+    for symbol in cryptocodes.legendre_symbol_batch(unpack(data, width), p):
+        if symbol == 1:
+            bits.append("1")
+        elif symbol == p - 1:
+            bits.append("0")
+        else:
+            raise ValueError("Unexpected value in Legendre test.")
+    if not bits:
+        return b""
+    # like np.packbits: a last partial byte is padded with zero bits on the right
+    bits.extend("0" * (-len(bits) % 8))
+    return int("".join(bits), 2).to_bytes(len(bits) // 8, "big")
+
+
+# --- pipeline ---
+
+def _map(func, jobs, workers: int):
+    '''Ordered map over the jobs, in a process pool unless workers == 0.'''
+    if workers == 0:
+        yield from map(func, jobs)
+        return
+    with Pool(workers) as pool:
+        yield from pool.imap(func, jobs)
+
+def encrypt_file(plaintext: bytes, path: str, seed, a: int = DEFAULT_A, p: int = DEFAULT_P,
+                 workers: int = None, chunk_bytes: int = 4096) -> None:
+    with IntArrayWriter(path, p.bit_length(), p) as out:
+        jobs = ((i, plaintext[start:start + chunk_bytes], seed, a, p, out.width)
+                for i, start in enumerate(range(0, len(plaintext), chunk_bytes)))
+        for data in _map(encrypt_chunk, jobs, workers):
+            out.write_raw(data)
+
+def decrypt_file(path: str, out, workers: int = None, chunk_bytes: int = 4096) -> int:
+    '''Decrypt the ciphertext file into the binary stream `out`; returns the number of plaintext bytes.'''
+    written = 0
+    with IntArrayFile(path) as reader:
+        if reader.modulus is None:
+            raise ValueError(f"{path}: the ciphertext file has no modulus p")
+        # in this process the chunks stay views into the mmap; worker processes need a (pickled) copy
+        jobs = ((data if workers == 0 else bytes(data), reader.modulus, reader.width)
+                for data in reader.raw_chunks(8 * chunk_bytes))
+        for data in _map(decrypt_chunk, jobs, workers):
+            out.write(data)
+            written += len(data)
+    return written
+
+
+def check(bits: int, seed, workers: int, chunk_bytes: int) -> None:
+    '''Round trip of random plaintext, and the same ciphertext through the original decrypt_flag.'''
+    plaintext = random.Random(f"{seed}/plaintext").randbytes(bits // 8)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ct.bin")
+        start = time.perf_counter()
+        encrypt_file(plaintext, path, seed, workers=workers, chunk_bytes=chunk_bytes)
+        encrypt_s = time.perf_counter() - start
+
+        with open(os.path.join(tmp, "pt.bin"), "w+b") as out:
+            start = time.perf_counter()
+            decrypt_file(path, out, workers, chunk_bytes)
+            decrypt_s = time.perf_counter() - start
+            out.seek(0)
+            assert out.read() == plaintext, "round trip failed"
+
+        with IntArrayFile(path) as reader:
+            sample = next(reader.chunks(8 * 64))
+        assert cryptocodes.decrypt_flag(sample) == plaintext[:64], "differs from decrypt_flag"
+
+    n = 8 * len(plaintext)
+    print(f"{n} bits: encrypt {encrypt_s:.3f} s ({n / encrypt_s:,.0f} bits/s), "
+          f"decrypt {decrypt_s:.3f} s ({n / decrypt_s:,.0f} bits/s), round trip OK")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chunked, process-parallel Adrien's Signs encoder/decoder.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    enc = sub.add_parser("encrypt")
+    enc.add_argument("--input", help="plaintext file (default: random plaintext of --bits bits)")
+    enc.add_argument("--bits", type=int, default=1_000_000, help="random plaintext size, rounded down to bytes")
+    enc.add_argument("-o", "--output", required=True)
+    dec = sub.add_parser("decrypt")
+    dec.add_argument("input")
+    dec.add_argument("-o", "--output", help="plaintext file (default: stdout)")
+    chk = sub.add_parser("check")
+    chk.add_argument("--bits", type=int, default=100_000)
+    for p in (enc, dec, chk):
+        p.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                       help="worker processes, 0 = run in this process (default: CPU count)")
+        p.add_argument("--chunk-bytes", type=int, default=4096, help="plaintext bytes per chunk")
+    for p in (enc, chk):
+        p.add_argument("--seed", default="0")
+    args = parser.parse_args()
+
+    if args.command == "encrypt":
+        if args.input:
+            with open(args.input, "rb") as f:
+                plaintext = f.read()
+        else:
+            plaintext = random.Random(f"{args.seed}/plaintext").randbytes(args.bits // 8)
+        encrypt_file(plaintext, args.output, args.seed, workers=args.workers, chunk_bytes=args.chunk_bytes)
+    elif args.command == "decrypt":
+        if args.output:
+            with open(args.output, "wb") as out:
+                decrypt_file(args.input, out, args.workers, args.chunk_bytes)
+        else:
+            decrypt_file(args.input, sys.stdout.buffer, args.workers, args.chunk_bytes)
+    else:
+        check(args.bits, args.seed, args.workers, args.chunk_bytes)
+
+
+if __name__ == '__main__':
+    main()
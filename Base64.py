@@ -1,15 +1,23 @@
 import base64
 
-while True:
-    choice = input("Encode or Decode: ")
-
-    if choice.lower() == "encode":
-        encode = b"Hello, Wordl!"
-        encoded = base64.b64encode(encode)
-        print(encoded)
-        break
-
-    if choice.lower() == "decode":
-        decode = b'SGVsbG8sIFdvcmRsIQ=='
-        decoded = base64.b64decode(decode)
-        print(decoded)
+def encode(data: bytes) -> bytes:
+    return base64.b64encode(data)
+
+def decode(data: bytes) -> bytes:
+    return base64.b64decode(data)
+
+def main() -> None:
+    while True:
+        choice = input("Encode or Decode: ")
+
+        if choice.lower() == "encode":
+            print(encode(b"Hello, Wordl!"))
+            break
+
+        if choice.lower() == "decode":
+            print(decode(b'SGVsbG8sIFdvcmRsIQ=='))
+            break
+
+
+if __name__ == '__main__':
+    main()
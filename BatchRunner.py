@@ -0,0 +1,188 @@
+'''
+Batch runner: solve many small problems in one process instead of running one script per problem.
+
+Every script in this repo reads ONE problem with input() and exits, so pushing a million problems through them
+means starting a million interpreters. This runner reads newline-delimited JSON jobs (one per line) from a file
+or stdin, sends them to a pool of worker processes, and writes one JSON result per line:
+
+    {"id": 1, "op": "crt", "a": [2, 3, 2], "n": [3, 5, 7]}          ->  {"id": 1, "op": "crt", "result": [23, 105]}
+    {"id": 2, "op": "sqrt", "a": 10, "p": 13}                        ->  {"id": 2, "op": "sqrt", "result": 6}
+    {"id": 3, "op": "modinv", "a": 3, "m": 13}                       ->  {"id": 3, "op": "modinv", "result": 9}
+
+A job that fails gives {"id": ..., "op": ..., "error": "..."} and the run goes on. Results come back in input
+order (or as soon as they are ready with --unordered; use the "id" field to match them up). When the input is
+done, a per-op throughput table is printed on stderr.
+
+Supported ops and their fields:
+    crt        a (list), n (list)            -> [x, N]          crt_stepwise
+    sqrt       a, p                          -> root or null    tonelli_shanks
+    modinv     a, m                          -> inverse         modinv
+    legendre   a, p                          -> 1, p - 1 or 0   legendre_symbol
+    gcd        a, b                          -> gcd             GCDWhileLoop
+    egcd       a, b                          -> [g, x, y]       extendedGCD
+    modexp     base, exponent, modulus       -> value           mod_exp
+    mod        x, m                          -> value           moduloCalc
+    xor        data (hex), key (hex)         -> hex             xor_bytes
+
+Repeated jobs can be answered from a cache (see Memo.py): --memo modinv,legendre,mod (or "all") switches it on
+for those functions, and --memo-store FILE keeps the answers in an sqlite file for the next run.
+
+Usage:
+    python BatchRunner.py jobs.jsonl -o results.jsonl --workers 8
+    python BatchRunner.py jobs.jsonl --memo all --memo-store memo.sqlite
+    cat jobs.jsonl | python BatchRunner.py
+'''
+
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import cryptocodes
+
+
+def _crt(job):
+    return list(cryptocodes.crt_stepwise(job["a"], job["n"]))
+
+def _egcd(job):
+    return list(cryptocodes.CryptoKernels.extendedGCD(job["a"], job["b"]))
+
+def _xor(job):
+    return cryptocodes.xor_bytes(bytes.fromhex(job["data"]), bytes.fromhex(job["key"])).hex()
+
+
+# op -> function(job) returning a JSON-serializable result
+OPS = {
+    "crt": _crt,
+    "sqrt": lambda job: cryptocodes.tonelli_shanks(job["a"], job["p"]),
+    "modinv": lambda job: cryptocodes.CryptoKernels.modinv(job["a"], job["m"]),
+    "legendre": lambda job: cryptocodes.legendre_symbol(job["a"], job["p"]),
+    "gcd": lambda job: cryptocodes.GCDWhileLoop(job["a"], job["b"]),
+    "egcd": _egcd,
+    "modexp": lambda job: cryptocodes.mod_exp(job["base"], job["exponent"], job["modulus"]),
+    "mod": lambda job: cryptocodes.CryptoKernels.moduloCalc(job["x"], job["m"]),
+    "xor": _xor,
+}
+
+
+# --memo uses the op names; Memo uses the function names
+MEMO_FUNCTIONS = {"modinv": "modinv", "legendre": "legendre_symbol", "mod": "moduloCalc"}
+
+def setup_memo(ops: list, store: str = None) -> None:
+    '''Switch on the caches for `ops` (and the on-disk store); also runs at the start of every worker process.'''
+    memo = cryptocodes.Memo
+    if "all" in ops:
+        memo.enable()
+    else:
+        memo.enable(*(MEMO_FUNCTIONS[op] for op in ops))
+    if store:
+        memo.open_store(store)
+
+
+def run_job(line: str) -> tuple[str, str, float, bool]:
+    '''
+    Solve one job given as a JSON line.
+    Returns (result line, op, seconds spent, failed) so the parent can keep per-op statistics.
+    '''
+    start = time.perf_counter()
+    job_id, op = None, None
+    try:
+        job = json.loads(line)
+        job_id, op = job.get("id"), job.get("op")
+        if op not in OPS:
+            raise ValueError(f"Unknown op: {op!r}")
+        out = {"id": job_id, "op": op, "result": OPS[op](job)}
+        failed = False
+    except Exception as e:
+        out = {"id": job_id, "op": op, "error": f"{type(e).__name__}: {e}"}
+        failed = True
+    return json.dumps(out), str(op), time.perf_counter() - start, failed
+
+
+def _jobs(stream):
+    for line in stream:
+        if line.strip():
+            yield line
+
+
+class Stats:
+    '''Per-op counters; compute time is summed over all workers.'''
+
+    def __init__(self) -> None:
+        self.ops = {}
+        self.start = time.perf_counter()
+
+    def add(self, op: str, seconds: float, failed: bool) -> None:
+        count, errors, total = self.ops.get(op, (0, 0, 0.0))
+        self.ops[op] = (count + 1, errors + failed, total + seconds)
+
+    def report(self, stream=sys.stderr) -> None:
+        wall = time.perf_counter() - self.start
+        jobs = sum(count for count, _, _ in self.ops.values())
+        print(f"{'op':>10} {'jobs':>10} {'errors':>8} {'cpu s':>10} {'jobs/cpu s':>12}", file=stream)
+        for op, (count, errors, total) in sorted(self.ops.items()):
+            rate = count / total if total else float("inf")
+            print(f"{op:>10} {count:>10} {errors:>8} {total:>10.3f} {rate:>12.0f}", file=stream)
+        print(f"{jobs} jobs in {wall:.3f} s wall ({jobs / wall if wall else 0:.0f} jobs/s)", file=stream)
+
+
+def run(stream, out, workers: int = None, ordered: bool = True, chunksize: int = 256,
+        memo: list = None, memo_store: str = None) -> Stats:
+    '''Run every job from `stream` and write the result lines to `out`. workers=0 runs in this process.'''
+    stats = Stats()
+    if workers == 0:
+        if memo:
+            setup_memo(memo, memo_store)
+        results = map(run_job, _jobs(stream))
+        pool = None
+    else:
+        pool = Pool(workers, setup_memo if memo else None, (memo, memo_store))
+        mapper = pool.imap if ordered else pool.imap_unordered
+        results = mapper(run_job, _jobs(stream), chunksize)
+
+    try:
+        for line, op, seconds, failed in results:
+            out.write(line + "\n")
+            stats.add(op, seconds, failed)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run newline-delimited JSON jobs through the math functions.")
+    parser.add_argument("input", nargs="?", help="jobs file (default: stdin)")
+    parser.add_argument("-o", "--output", help="results file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="worker processes, 0 = run in this process (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=256, help="jobs sent to a worker at a time")
+    parser.add_argument("--unordered", action="store_true", help="write results as soon as they are ready")
+    parser.add_argument("-q", "--quiet", action="store_true", help="don't print the throughput report")
+    parser.add_argument("--memo", help=f"cache results of these ops: {','.join(MEMO_FUNCTIONS)} or all")
+    parser.add_argument("--memo-store", help="sqlite file that keeps cached results between runs (needs --memo)")
+    args = parser.parse_args()
+
+    memo = args.memo.split(",") if args.memo else None
+    for op in memo or ():
+        if op != "all" and op not in MEMO_FUNCTIONS:
+            parser.error(f"--memo: {op!r} can't be cached (choose from {', '.join(MEMO_FUNCTIONS)} or all)")
+
+    stream = open(args.input, "r") if args.input else sys.stdin
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        stats = run(stream, out, args.workers, not args.unordered, args.chunksize, memo, args.memo_store)
+    finally:
+        if args.input:
+            stream.close()
+        if args.output:
+            out.close()
+    if not args.quiet:
+        stats.report()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+'''
+Benchmark suite for every algorithm in the repo.
+
+Each case is timed for a range of input sizes:
+    - number theory (GCD, extended GCD, modinv, CRT, Legendre, Tonelli-Shanks, moduloCalc, mod_exp):
+      16, 64, 256, 1024, 2048 and 4096-bit numbers
+    - byte-oriented code (XOR, xor_bytes, Base64, HEX2ASCII, ASCII2Char):
+      1 KB up to 1 GB of data (only up to --max-bytes, 1 MB by default; big sizes need a lot of RAM and time)
+
+The time reported is the best of a few runs, per call. When one call of a case takes longer than --max-seconds,
+the larger sizes of that case are skipped. A case that raises (for example GCDRecursive hitting the recursion
+limit on 4096-bit numbers) is recorded as an error instead of a time, which is also worth knowing.
+
+Some cases exist to COMPARE implementations of the same thing:
+    gcd_recursive vs gcd_while_loop                    (EuclideanAlgorithm.py)
+    modinv_fermat vs modinv_euclid vs modinv           (the two paths of modinv, and the dispatcher itself;
+                                                        modinv's trial-division primality test takes
+                                                        minutes on a 64-bit prime, so it stops at 16 bits)
+    crt_stepwise vs crt_batch                          (one system vs a batch of 100 sharing the moduli)
+    xor_str vs xor_bytes                               (XOR.XOR on str vs XOR.xor_bytes on bytes)
+
+Baselines:
+    python Benchmark.py --save baseline.json                  # record
+    python Benchmark.py --baseline baseline.json              # compare, exit 1 on a regression
+A regression is a case that got slower than the baseline by more than --threshold (default 25%), or that had a
+time in the baseline and now raises, is skipped or is gone.
+The baseline also stores the primes it used, so a comparison runs on exactly the same inputs (and doesn't spend
+half a minute looking for a 4096-bit prime again).
+'''
+
+import argparse
+import fnmatch
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+
+import cryptocodes
+from ModContextBenchmark import random_prime
+
+BIT_SIZES = (16, 64, 256, 1024, 2048, 4096)
+KB = 1024
+BYTE_SIZES = (KB, 64 * KB, KB * KB, 16 * KB * KB, 256 * KB * KB, KB * KB * KB)
+
+
+def _size_label(kind: str, size: int) -> str:
+    if kind == "bits":
+        return f"{size}b"
+    for unit, factor in (("GB", KB ** 3), ("MB", KB ** 2), ("KB", KB)):
+        if size >= factor:
+            return f"{size // factor}{unit}"
+    return f"{size}B"
+
+
+class Inputs:
+    '''Random inputs for the cases; primes are cached (and can be loaded from a baseline).'''
+
+    def __init__(self, seed: int, primes: dict = None) -> None:
+        self.rng = random.Random(seed)
+        self.primes = {int(bits): p for bits, p in (primes or {}).items()}
+
+    def number(self, bits: int) -> int:
+        return self.rng.getrandbits(bits) | (1 << (bits - 1))
+
+    def prime(self, bits: int) -> int:
+        '''A prime p ≡ 1 mod 8 of exactly `bits` bits, so Tonelli-Shanks takes its general path.'''
+        if bits not in self.primes:
+            self.primes[bits] = random_prime(bits, self.rng)
+        return self.primes[bits]
+
+    def data(self, size: int) -> bytes:
+        return self.rng.randbytes(size)
+
+
+# --- cases: name -> (kind, max size or None, setup(inputs, size) -> args, function) ---
+
+_ASCII = bytes(range(128)) * 2
+
+def _gcd_args(inp, bits):
+    return inp.number(bits), inp.number(bits)
+
+def _prime_args(inp, bits):
+    p = inp.prime(bits)
+    return inp.rng.randrange(2, p), p
+
+def _sqrt_args(inp, bits):
+    p = inp.prime(bits)
+    return pow(inp.rng.randrange(2, p), 2, p), p
+
+def _crt_moduli(inp, bits, k=4):
+    # random pairwise coprime moduli (no need for primes, and big primes are slow to find)
+    moduli = []
+    while len(moduli) < k:
+        n = inp.number(bits) | 1
+        if all(cryptocodes.GCDWhileLoop(n, m) == 1 for m in moduli):
+            moduli.append(n)
+    return moduli
+
+def _crt_args(inp, bits):
+    moduli = _crt_moduli(inp, bits)
+    return [inp.rng.randrange(n) for n in moduli], moduli
+
+def _crt_batch_args(inp, bits):
+    moduli = _crt_moduli(inp, bits)
+    return [[inp.rng.randrange(n) for n in moduli] for _ in range(100)], moduli
+
+def _mod_exp_args(inp, bits):
+    p = inp.prime(bits)
+    return inp.rng.randrange(2, p), inp.number(bits), p
+
+def _ascii(inp, size):
+    return inp.data(size).translate(_ASCII)
+
+def _text_args(inp, size):
+    return _ascii(inp, size).decode("ascii"), 13
+
+CASES = {
+    "gcd_recursive": ("bits", None, _gcd_args, lambda a, b: cryptocodes.GCDRecursive(a, b)),
+    "gcd_while_loop": ("bits", None, _gcd_args, lambda a, b: cryptocodes.GCDWhileLoop(a, b)),
+    "extended_gcd": ("bits", None, _gcd_args, lambda a, b: cryptocodes.extendedGCD(a, b)),
+    "modinv_fermat": ("bits", None, _prime_args, lambda a, m: pow(a, m - 2, m)),
+    "modinv_euclid": ("bits", None, _prime_args, lambda a, m: cryptocodes.modinv_euclid(a, m)),
+    "modinv": ("bits", 16, _prime_args, lambda a, m: cryptocodes.modinv(a, m)),
+    "crt_stepwise": ("bits", None, _crt_args, lambda a, n: cryptocodes.crt_stepwise(a, n)),
+    "crt_batch_100": ("bits", None, _crt_batch_args, lambda a, n: cryptocodes.crt_batch(a, n)),
+    "legendre_symbol": ("bits", None, _prime_args, lambda a, p: cryptocodes.legendre_symbol(a, p)),
+    "tonelli_shanks": ("bits", None, _sqrt_args, lambda a, p: cryptocodes.tonelli_shanks(a, p)),
+    "moduloCalc": ("bits", None, lambda inp, bits: (inp.number(bits), 65537),
+                   lambda x, m: cryptocodes.moduloCalc(x, m)),
+    "mod_exp": ("bits", None, _mod_exp_args, lambda b, e, m: cryptocodes.mod_exp(b, e, m)),
+    "xor_str": ("bytes", None, _text_args, lambda s, k: cryptocodes.XOR(s, k)),
+    "xor_bytes": ("bytes", None, lambda inp, size: (inp.data(size), inp.data(16)),
+                  lambda d, k: cryptocodes.xor_bytes(d, k)),
+    "base64_encode": ("bytes", None, lambda inp, size: (inp.data(size),),
+                      lambda d: cryptocodes.Base64.encode(d)),
+    "base64_decode": ("bytes", None, lambda inp, size: (cryptocodes.Base64.encode(inp.data(size)),),
+                      lambda d: cryptocodes.Base64.decode(d)),
+    "hex_encode": ("bytes", None, lambda inp, size: (_ascii(inp, size).decode("ascii"),),
+                   lambda s: cryptocodes.HEX2ASCII.encode(s)),
+    "hex_decode": ("bytes", None, lambda inp, size: (_ascii(inp, size // 2).hex(),),
+                   lambda h: cryptocodes.HEX2ASCII.decode(h)),
+    "ascii2char_encode": ("bytes", None, lambda inp, size: (_ascii(inp, size).decode("ascii"),),
+                          lambda s: cryptocodes.ASCII2Char.encode(s)),
+    "ascii2char_decode": ("bytes", None, lambda inp, size: (list(_ascii(inp, size)),),
+                          lambda codes: cryptocodes.ASCII2Char.decode(codes)),
+}
+
+
+def time_call(func, args, repeat: int = 3) -> float:
+    '''Best time of one call, in seconds (calls are grouped so that each measurement lasts >= 0.2 s).'''
+    timer = timeit.Timer(lambda: func(*args))
+    number, total = timer.autorange()
+    if total > 1.0:
+        return total / number
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run(cases: dict, inputs: Inputs, max_bits: int, max_bytes: int, max_seconds: float, out=sys.stdout) -> dict:
+    '''Time every case at every size; returns {"case/size": seconds or "error: ..." or "skipped"}.'''
+    results = {}
+    for name, (kind, case_max, setup, func) in cases.items():
+        sizes = BIT_SIZES if kind == "bits" else BYTE_SIZES
+        limit = max_bits if kind == "bits" else max_bytes
+        if case_max is not None:
+            limit = min(limit, case_max)
+        too_slow = False
+        for size in sizes:
+            if size > limit:
+                break
+            key = f"{name}/{_size_label(kind, size)}"
+            if too_slow:
+                results[key] = "skipped"
+                continue
+            args = setup(inputs, size)
+            try:
+                seconds = time_call(func, args)
+            except Exception as e:
+                results[key] = f"error: {type(e).__name__}"
+            else:
+                results[key] = seconds
+                too_slow = seconds > max_seconds
+            print(f"{key:<32} {_format(results[key])}", file=out, flush=True)
+    return results
+
+
+def _format(value) -> str:
+    if not isinstance(value, float):
+        return value
+    for unit, factor in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if value >= factor:
+            return f"{value / factor:10.3f} {unit}"
+    return f"{value / 1e-9:10.3f} ns"
+
+
+def planned_keys(cases: dict, max_bits: int, max_bytes: int) -> set:
+    '''Every "case/size" key a run of these cases covers with these limits (ignoring the cases' own size limits).'''
+    keys = set()
+    for name, (kind, _, _, _) in cases.items():
+        sizes = BIT_SIZES if kind == "bits" else BYTE_SIZES
+        limit = max_bits if kind == "bits" else max_bytes
+        keys.update(f"{name}/{_size_label(kind, size)}" for size in sizes if size <= limit)
+    return keys
+
+
+def compare(results: dict, baseline: dict, threshold: float, planned: set = None) -> list:
+    '''
+    Print current vs baseline and return the keys that got slower than threshold allows.
+    A case that had a time in the baseline and now has none (an error, "skipped", or no result at all while it is
+    in `planned`) is a regression too.
+    '''
+    regressions = []
+    print(f"\n{'case':<32} {'baseline':>13} {'now':>13} {'ratio':>7}")
+    keys = list(results) + sorted(k for k in baseline if k not in results and k in (planned or ()))
+    for key in keys:
+        now, before = results.get(key, "missing"), baseline.get(key)
+        if not isinstance(before, float):
+            continue
+        if not isinstance(now, float):
+            regressions.append(key)
+            print(f"{key:<32} {_format(before)} {now:>13} {'':>7}  REGRESSION")
+            continue
+        ratio = now / before
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(f"{key:<32} {_format(before)} {_format(now)} {ratio:7.2f}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark every algorithm module across input sizes.")
+    parser.add_argument("-k", "--cases", default="*", help="glob of case names to run, e.g. 'gcd*' (default: all)")
+    parser.add_argument("--max-bits", type=int, default=4096)
+    parser.add_argument("--max-bytes", type=int, default=KB * KB, help="largest data size (up to 1 GB)")
+    parser.add_argument("--max-seconds", type=float, default=2.0, help="skip bigger sizes after a call this slow")
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--baseline", help="compare with a JSON baseline, exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    cases = {name: case for name, case in CASES.items() if fnmatch.fnmatch(name, args.cases)}
+    inputs = Inputs(args.seed, baseline["primes"] if baseline else None)
+    results = run(cases, inputs, args.max_bits, args.max_bytes, args.max_seconds)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "meta": {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "seed": args.seed,
+                },
+                "primes": {str(bits): p for bits, p in sorted(inputs.primes.items())},
+                "results": results,
+            }, f, indent=2)
+        print(f"\nSaved {len(results)} results to {args.save}")
+
+    if baseline is not None:
+        planned = planned_keys(cases, args.max_bits, args.max_bytes)
+        regressions = compare(results, baseline["results"], args.threshold, planned)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == '__main__':
+    main()
@@ -35,6 +35,7 @@ Let:
 The result x is the unique integer modulo N that satisfies all the congruences.
 """
 
+import Instrumentation
 from ExtendedGCD import extendedGCD
 
 def modinv(a, m):
@@ -59,13 +60,46 @@ def combine_congruences(a1, n1, a2, n2):
     return combined_a, combined_n
 
 def crt_stepwise(a_list, n_list):
+    stats = Instrumentation.ENABLED
+    if stats:
+        start = Instrumentation.clock()
     # Sort pairs by modulus descending
     pairs = sorted(zip(a_list, n_list), key=lambda x: x[1], reverse=True)
     a, n = pairs[0]
     for a_i, n_i in pairs[1:]:
         a, n = combine_congruences(a, n, a_i, n_i)
+    if stats:
+        Instrumentation.count("crt_stepwise.combines", len(pairs) - 1)
+        Instrumentation.observe("crt_stepwise.congruences", len(pairs))
+        Instrumentation.observe("crt_stepwise.modulus_bits", n.bit_length())
+        Instrumentation.record_time("crt_stepwise", start)
     return a, n
 
+def crt_batch(a_lists, n_list):
+    '''
+    Solve many systems that share the same moduli, e.g. many residue vectors modulo the same primes.
+    The CRT basis e_i (e_i ≡ 1 mod n_i, e_i ≡ 0 mod n_j for j ≠ i) is computed once, then every
+    system costs k multiplications:  x = Σ a_i * e_i mod N.
+    Gives the same (x, N) as crt_stepwise for each system.
+    Raises ValueError when a system does not have one remainder per modulus.
+    '''
+    a_lists = list(a_lists)     # may be an iterator (IntArrayFile.crt passes a zip), and it is walked twice
+    for a_list in a_lists:
+        if len(a_list) != len(n_list):
+            raise ValueError(f"{len(a_list)} remainders for {len(n_list)} moduli")
+    if len(n_list) == 1:
+        return [(a_list[0], n_list[0]) for a_list in a_lists]
+
+    N = 1
+    for n in n_list:
+        N *= n
+    basis = []
+    for n in n_list:
+        N_i = N // n
+        basis.append(N_i * modinv(N_i % n, n))
+
+    return [(sum(a * e for a, e in zip(a_list, basis)) % N, N) for a_list in a_lists]
+
 def main():
     k = int(input("Enter number of congruences: "))
     a_list = []
@@ -0,0 +1,144 @@
+/*
+Shared-library build of the C/C++ kernels in this repo, so Python can call them through ctypes (see CryptoKernels.py).
+
+The functions are the same ones as in ExtendedGCD.c, ModularArithmetic1.c, ModularArithmetic2.c,
+ModularInverting_MultiplicativeInverse.cpp, QuadraticResidues.cpp and XOR.cpp, without the interactive main(),
+and give EXACTLY the same answers as the Python versions. Only the signatures differ where ctypes needs it:
+modinv and find_square_roots return a status and write their results through pointers, and XOR works on a byte
+buffer instead of a std::string. A fix to a kernel goes in BOTH places; the ones so far:
+
+  - moduloCalc: reversing the digits of x dropped trailing zeros (100 became 1); the digits are now collected
+    into a buffer and read left to right.
+  - modinv_euclid: unsigned coefficients wrapped around when x1 - q * x0 went negative; they are signed now and
+    the result is brought back into [0, m) like Python's %.
+  - mod_exp: base * base overflowed 64 bits for base >= 2^32, and modulus 1 gave 1 instead of 0.
+  - is_prime: i * i overflowed for n close to 2^64.
+  - is_quadratic_residue / find_square_roots: like Python, 0 is not special-cased and the search starts at 1.
+
+Build:
+    gcc -O2 -shared -fPIC -o libcryptokernels.so CryptoKernels.c
+or simply run:
+    python CryptoKernels.py
+
+Like the other C files, this needs __uint128_t (GCC/Clang on Linux, not MinGW).
+*/
+#include <stddef.h>
+#include <stdint.h>
+
+long long extendedGCD(long long a, long long b, long long *x, long long *y){
+    if (b == 0){
+        *x = 1;
+        *y = 0;
+        return a;
+    }
+
+    long long x1, y1;
+    long long gcd = extendedGCD(b, a % b, &x1, &y1);
+
+    *x = y1;
+    *y = x1 - (a / b) * y1;
+
+    return gcd;
+}
+
+long long moduloCalc(long long x, long long m){
+    // This function calculates the value of Y in X ≡ Y mod m, reading the digits of x from left to right
+    char digits[20];
+    int n = 0;
+
+    do {
+        digits[n++] = (char)(x % 10);
+        x /= 10;
+    } while (x > 0);
+
+    long long current = 0;
+    while (n > 0){
+        current = (current * 10 + digits[--n]) % m;
+    }
+    return current;
+}
+
+uint64_t mod_exp(uint64_t base, uint64_t exponent, uint64_t modulus){
+    __uint128_t result = 1 % modulus;
+    __uint128_t current = base % modulus;
+
+    while (exponent > 0) {
+        if (exponent & 1) {
+            result = (result * current) % modulus;
+        }
+        current = (current * current) % modulus;
+        exponent >>= 1;
+    }
+
+    return (uint64_t)result;
+}
+
+int is_prime(uint64_t n){
+    if (n <= 1) return 0;
+    if (n <= 3) return 1;
+    if (n % 2 == 0 || n % 3 == 0) return 0;
+    uint64_t i = 5;
+    while (i <= n / i){
+        if (n % i == 0 || n % (i + 2) == 0) return 0;
+        i += 6;
+    }
+    return 1;
+}
+
+// Returns 0 on success, -1 when the loop would divide by zero (gcd(a, m) != 1), like Python's ZeroDivisionError
+int modinv_euclid(uint64_t a, uint64_t m, uint64_t *out){
+    uint64_t m0 = m;
+    long long x0 = 0, x1 = 1;
+    if (m == 1){
+        *out = 0;
+        return 0;
+    }
+
+    while (a > 1){
+        if (m == 0) return -1;
+        uint64_t q = a / m;
+        uint64_t temp = m;
+        m = a % m;
+        a = temp;
+
+        long long tempX = x0;
+        x0 = x1 - (long long)q * x0;
+        x1 = tempX;
+    }
+
+    long long r = x1 % (long long)m0;
+    *out = (uint64_t)(r < 0 ? r + (long long)m0 : r);
+    return 0;
+}
+
+int modinv(uint64_t a, uint64_t m, uint64_t *out){
+    if (is_prime(m)){
+        *out = mod_exp(a, m - 2, m);
+        return 0;
+    }
+    return modinv_euclid(a, m, out);
+}
+
+int is_quadratic_residue(uint64_t x, uint64_t p){
+    return mod_exp(x, (p - 1) / 2, p) == 1;
+}
+
+// Returns 1 and sets root1/root2 when a root exists, 0 otherwise
+int find_square_roots(uint64_t x, uint64_t p, uint64_t *root1, uint64_t *root2){
+    uint64_t target = x % p;
+    for (uint64_t a = 1; a < p; a++){
+        __uint128_t sq = (__uint128_t)a * a;
+        if ((uint64_t)(sq % p) == target){
+            *root1 = a;
+            *root2 = p - a;
+            return 1;
+        }
+    }
+    return 0;
+}
+
+void XOR(const unsigned char *message, size_t length, int key, unsigned char *result){
+    for (size_t i = 0; i < length; i++){
+        result[i] = (unsigned char)(message[i] ^ key);
+    }
+}
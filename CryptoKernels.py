@@ -0,0 +1,284 @@
+'''
+Python front-end for the compiled kernels in CryptoKernels.c.
+
+The repo has C/C++ versions of extendedGCD, moduloCalc, mod_exp, modinv, is_quadratic_residue, find_square_roots
+and XOR, but until now Python could not reach them. This module loads them from a shared library with ctypes and
+exposes functions with the SAME names and results as the Python modules:
+
+        from CryptoKernels import modinv, find_square_roots
+
+When the library is not built (or CRYPTOCODES_NO_EXTENSION=1 is set), every function simply calls the pure Python
+version, so code using this module works either way. The choice is made once, at import time; HAVE_EXTENSION tells
+you which one you got.
+
+The C kernels only work on 64-bit integers. Anything that does not fit (big RSA-sized numbers, negative values, ...)
+is also sent to the Python version, call by call.
+
+Where does C actually help? Calling through ctypes costs around a microsecond, so the win comes from functions
+that LOOP in Python: moduloCalc, extendedGCD, modinv (the trial-division primality test) and find_square_roots.
+mod_exp and is_quadratic_residue are built on Python's pow(), which is already C, so they keep using it.
+Run `python CryptoKernels.py` to build the library, check both paths agree and see the timings.
+
+With Instrumentation on, a call that goes to C is only counted and timed as "<name>.compiled": the C code has
+none of the inner counters (trial divisions, division steps, ...). Set CRYPTOCODES_NO_EXTENSION=1 to get those.
+
+modinv and moduloCalc use the same Memo caches as the Python versions (see Memo.py), whichever path they take.
+'''
+
+import ctypes
+import os
+import random
+import subprocess
+import sys
+import timeit
+
+import Instrumentation
+import Memo
+from ExtendedGCD import extendedGCD as _py_extendedGCD
+from ModularArithmetic1 import moduloCalc as _py_moduloCalc
+from ModularArithmetic2 import mod_exp as _py_mod_exp
+from ModularInverting_MultiplicativeInverse import modinv as _py_modinv
+from QuadraticResidues import is_quadratic_residue as _py_is_quadratic_residue
+from QuadraticResidues import find_square_roots as _py_find_square_roots
+from XOR import XOR as _py_XOR
+
+# modinv and moduloCalc below share the cache of the Python versions; call the uncached ones, so a miss is not
+# looked up twice
+_py_moduloCalc = _py_moduloCalc.__wrapped__
+_py_modinv = _py_modinv.__wrapped__
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+SOURCE = os.path.join(_HERE, "CryptoKernels.c")
+LIBRARY = os.path.join(_HERE, "libcryptokernels" + (".dll" if sys.platform == "win32" else ".so"))
+
+_INT62 = 1 << 62
+_INT63 = 1 << 63
+_UINT64 = 1 << 64
+
+_c_ll = ctypes.c_longlong
+_c_u64 = ctypes.c_uint64
+
+
+def build(compiler: str = None) -> str:
+    '''Compile CryptoKernels.c into a shared library next to it and return its path.'''
+    compiler = compiler or os.environ.get("CC", "gcc")
+    subprocess.run([compiler, "-O2", "-shared", "-fPIC", "-o", LIBRARY, SOURCE], check=True)
+    return LIBRARY
+
+
+def _load():
+    if os.environ.get("CRYPTOCODES_NO_EXTENSION") == "1" or not os.path.exists(LIBRARY):
+        return None
+    try:
+        lib = ctypes.CDLL(LIBRARY)
+    except OSError:
+        return None
+
+    lib.extendedGCD.argtypes = [_c_ll, _c_ll, ctypes.POINTER(_c_ll), ctypes.POINTER(_c_ll)]
+    lib.extendedGCD.restype = _c_ll
+    lib.moduloCalc.argtypes = [_c_ll, _c_ll]
+    lib.moduloCalc.restype = _c_ll
+    lib.mod_exp.argtypes = [_c_u64, _c_u64, _c_u64]
+    lib.mod_exp.restype = _c_u64
+    lib.modinv.argtypes = [_c_u64, _c_u64, ctypes.POINTER(_c_u64)]
+    lib.modinv.restype = ctypes.c_int
+    lib.is_quadratic_residue.argtypes = [_c_u64, _c_u64]
+    lib.is_quadratic_residue.restype = ctypes.c_int
+    lib.find_square_roots.argtypes = [_c_u64, _c_u64, ctypes.POINTER(_c_u64), ctypes.POINTER(_c_u64)]
+    lib.find_square_roots.restype = ctypes.c_int
+    lib.XOR.argtypes = [ctypes.c_char_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_char_p]
+    lib.XOR.restype = None
+    return lib
+
+
+_lib = _load()
+HAVE_EXTENSION = _lib is not None
+
+
+# --- compiled versions (only valid for 64-bit inputs, no range checks) ---
+
+def _c_extendedGCD(a, b):
+    x, y = _c_ll(), _c_ll()
+    g = _lib.extendedGCD(a, b, ctypes.byref(x), ctypes.byref(y))
+    return g, x.value, y.value
+
+def _c_moduloCalc(X, m):
+    return _lib.moduloCalc(X, m)
+
+def _c_mod_exp(base, exponent, modulus):
+    return _lib.mod_exp(base, exponent, modulus)
+
+def _c_modinv(a, m):
+    out = _c_u64()
+    if _lib.modinv(a, m, ctypes.byref(out)) != 0:
+        raise ZeroDivisionError("integer division or modulo by zero")
+    return out.value
+
+def _c_is_quadratic_residue(x, p):
+    return bool(_lib.is_quadratic_residue(x, p))
+
+def _c_find_square_roots(x, p):
+    r1, r2 = _c_u64(), _c_u64()
+    if _lib.find_square_roots(x, p, ctypes.byref(r1), ctypes.byref(r2)):
+        return (r1.value, r2.value)
+    return None
+
+def _c_XOR(message, key):
+    data = message.encode("latin-1")
+    out = ctypes.create_string_buffer(len(data))
+    _lib.XOR(data, len(data), key, out)
+    return out.raw.decode("latin-1")
+
+
+# --- public functions: compiled when possible, pure Python otherwise ---
+
+def _c_counted(name, c_func, *args):
+    '''
+    A compiled call while Instrumentation is on. The C code keeps no counters of its own, so only the call and
+    its time are recorded, as "<name>.compiled" (the Python versions record the inner details).
+    '''
+    start = Instrumentation.clock()
+    try:
+        return c_func(*args)
+    finally:
+        Instrumentation.count(name + ".compiled")
+        Instrumentation.record_time(name + ".compiled", start)
+
+def extendedGCD(a, b):
+    # C truncates division towards zero and Python floors, so only non-negative inputs go to C
+    if _lib is not None and 0 <= a < _INT62 and 0 <= b < _INT62:
+        if Instrumentation.ENABLED:
+            return _c_counted("extendedGCD", _c_extendedGCD, a, b)
+        return _c_extendedGCD(a, b)
+    return _py_extendedGCD(a, b)
+
+@Memo.memoize("moduloCalc", 2)
+def moduloCalc(X: int, m: int) -> int:
+    if _lib is not None and 0 <= X < _INT63 and 0 < m < _INT62:
+        if Instrumentation.ENABLED:
+            return _c_counted("moduloCalc", _c_moduloCalc, X, m)
+        return _c_moduloCalc(X, m)
+    return _py_moduloCalc(X, m)
+
+def mod_exp(base, exponent, modulus, ctx=None):
+    return _py_mod_exp(base, exponent, modulus, ctx)
+
+@Memo.memoize("modinv", 2)
+def modinv(a: int, m: int) -> int:
+    if _lib is not None and 0 <= a < _UINT64 and 1 <= m < _INT63:
+        if Instrumentation.ENABLED:
+            return _c_counted("modinv", _c_modinv, a, m)
+        return _c_modinv(a, m)
+    return _py_modinv(a, m)
+
+def is_quadratic_residue(x, p, ctx=None):
+    return _py_is_quadratic_residue(x, p, ctx)
+
+def find_square_roots(x, p):
+    if _lib is not None and 0 <= x < _UINT64 and 1 <= p < _UINT64:
+        if Instrumentation.ENABLED:
+            return _c_counted("find_square_roots", _c_find_square_roots, x, p)
+        return _c_find_square_roots(x, p)
+    return _py_find_square_roots(x, p)
+
+def XOR(message, key):
+    if _lib is not None and 0 <= key < 256 and all(ord(c) < 256 for c in message):
+        if Instrumentation.ENABLED:
+            return _c_counted("XOR", _c_XOR, message, key)
+        return _c_XOR(message, key)
+    return _py_XOR(message, key)
+
+
+# --- parity check and timings ---
+
+def _same(c_func, py_func, *args):
+    try:
+        expected = py_func(*args)
+    except ZeroDivisionError:
+        expected = ZeroDivisionError
+    try:
+        got = c_func(*args)
+    except ZeroDivisionError:
+        got = ZeroDivisionError
+    return expected == got
+
+
+def parity_check(samples: int = 2000, seed: int = 0) -> list:
+    '''Run the same random inputs, up to the dispatch limits, through the C and Python paths; returns the mismatches.'''
+    if _lib is None:
+        raise RuntimeError("The extension is not built.")
+    rng = random.Random(seed)
+    small_primes = [3, 5, 7, 13, 17, 29, 65537, 1000003]
+    mismatches = []
+
+    def check(name, c_func, py_func, *args):
+        if not _same(c_func, py_func, *args):
+            mismatches.append((name, args))
+
+    def upto(limit):
+        # up to the dispatch limit, with the largest values that still go to C picked on purpose
+        return rng.choice([limit - 1, limit - 2, rng.randrange(limit // 2, limit), rng.randrange(limit)])
+
+    for _ in range(samples):
+        a, b = rng.randrange(0, 1 << 40), rng.randrange(0, 1 << 40)
+        m = rng.randrange(1, 1 << 20)
+        p = rng.choice(small_primes)
+        check("extendedGCD", _c_extendedGCD, _py_extendedGCD, a, b)
+        check("moduloCalc", _c_moduloCalc, _py_moduloCalc, rng.choice([a, a * 10, 100, 0]), m)
+        check("mod_exp", _c_mod_exp, lambda x, e, n: _py_mod_exp(x, e, n), a, b, m)
+        check("modinv", _c_modinv, _py_modinv, rng.randrange(0, m + 5), m)
+        check("is_quadratic_residue", _c_is_quadratic_residue, _py_is_quadratic_residue, a, p)
+        if p < 100:
+            check("find_square_roots", _c_find_square_roots, _py_find_square_roots, a, p)
+
+        # the same up to the limits in the dispatch functions below
+        check("extendedGCD", _c_extendedGCD, _py_extendedGCD, upto(_INT62), upto(_INT62))
+        check("moduloCalc", _c_moduloCalc, _py_moduloCalc, upto(_INT63), 1 + upto(_INT62 - 1))
+        check("mod_exp", _c_mod_exp, lambda x, e, n: _py_mod_exp(x, e, n),
+              upto(_UINT64), upto(_UINT64), 1 + upto(_UINT64 - 1))
+        # m has a small factor: a big prime m would take minutes in the trial-division primality tests
+        m = rng.randrange(2, 1000)
+        m *= 1 + upto(_INT63 // m - 1)
+        check("modinv", _c_modinv, _py_modinv, upto(_UINT64), m)
+        # a root below 1000 exists, so the brute-force searches stop early even for a 64-bit p
+        p = 1 + upto(_UINT64 - 1)
+        check("find_square_roots", _c_find_square_roots, _py_find_square_roots,
+              rng.randrange(1, 1000) ** 2 % p, p)
+        check("find_square_roots", _c_find_square_roots, _py_find_square_roots,
+              upto(_UINT64), rng.choice(small_primes[:5]))
+        text = "".join(chr(rng.randrange(256)) for _ in range(rng.randrange(20)))
+        check("XOR", _c_XOR, _py_XOR, text, rng.randrange(256))
+    return mismatches
+
+
+def main() -> None:
+    global _lib, HAVE_EXTENSION
+    if _lib is None:
+        print(f"Building {LIBRARY} ...")
+        build()
+        _lib = _load()
+        HAVE_EXTENSION = _lib is not None
+        if _lib is None:
+            print("Could not load the library (is CRYPTOCODES_NO_EXTENSION set?).")
+            return
+
+    mismatches = parity_check()
+    print(f"Parity check: {'OK' if not mismatches else f'{len(mismatches)} mismatches, e.g. {mismatches[:3]}'}")
+
+    cases = (
+        ("extendedGCD", _c_extendedGCD, _py_extendedGCD, (1234567890123456, 987654321987654)),
+        ("moduloCalc", _c_moduloCalc, _py_moduloCalc, (8146798528947, 17)),
+        ("mod_exp", _c_mod_exp, lambda x, e, n: _py_mod_exp(x, e, n), (27324678765, 65536, 65537)),
+        ("modinv", _c_modinv, _py_modinv, (3, 1000000007)),
+        ("find_square_roots", _c_find_square_roots, _py_find_square_roots, (5, 10007)),
+        ("XOR", _c_XOR, _py_XOR, ("Hello, World!" * 10, 13)),
+    )
+    print(f"\n{'function':>20} {'python (us)':>12} {'C (us)':>10}")
+    for name, c_func, py_func, args in cases:
+        py_time = min(timeit.repeat(lambda: py_func(*args), number=200, repeat=3)) / 200 * 1e6
+        c_time = min(timeit.repeat(lambda: c_func(*args), number=200, repeat=3)) / 200 * 1e6
+        print(f"{name:>20} {py_time:>12.2f} {c_time:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -35,9 +35,8 @@ def main() -> None:
     if a <= 0 or b <= 0:
         print("Please enter positive integers only.")
         return
-    print(GCDWhileLoop(a, b))
-    return
-    print(GCDRecursive(a, b))
+    print(f"While loop: {GCDWhileLoop(a, b)}")
+    print(f"Recursive:  {GCDRecursive(a, b)}")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -76,7 +76,12 @@ modulo a or b, depending on your goal.
 DIDN'T UNDERSTAND??? Check: https://youtu.be/6KmhCKxFWOs
 '''
 
+import Instrumentation
+
 def extendedGCD(a, b):
+    if Instrumentation.ENABLED:
+        # every level but the last is one division step; the base case is reached once per top-level call
+        Instrumentation.count("extendedGCD.division_steps" if b else "extendedGCD.calls")
     if b == 0:
         return a, 1, 0  # gcd, x, y
     gcd, x1, y1 = extendedGCD(b, a % b)
@@ -1,14 +1,21 @@
-while True:
-    choice = input("Encode or Decode: ")
-
-    if choice.lower() == "encode":
-        encode = 'Hello, World!'
-        encoded = encode.encode('utf-8').hex()
-        print(f"Encoded: {encoded}")
-        break
-    
-    if choice.lower() == "decode":
-        decode = "48656c6c6f2c20576f726c6421"
-        decoded = bytes.fromhex(decode).decode('utf-8')
-        print(f"Decoded: {decoded}")
-        break
\ No newline at end of file
+def encode(text: str) -> str:
+    return text.encode('utf-8').hex()
+
+def decode(hex_string: str) -> str:
+    return bytes.fromhex(hex_string).decode('utf-8')
+
+def main() -> None:
+    while True:
+        choice = input("Encode or Decode: ")
+
+        if choice.lower() == "encode":
+            print(f"Encoded: {encode('Hello, World!')}")
+            break
+
+        if choice.lower() == "decode":
+            print(f"Decoded: {decode('48656c6c6f2c20576f726c6421')}")
+            break
+
+
+if __name__ == '__main__':
+    main()
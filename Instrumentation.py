@@ -0,0 +1,152 @@
+'''
+Opt-in counters, timers and a sampling profiler for the number-theory routines.
+
+When a Tonelli-Shanks or CRT job is slow you want to know WHY: did the non-residue search take long, did the main
+loop run many times (m), did the CRT modulus grow huge? tonelli_shanks, crt_stepwise, modinv, extendedGCD and
+is_prime record exactly that, but only after you switch it on:
+
+        import Instrumentation
+        Instrumentation.enable()
+        tonelli_shanks(a, p)
+        print(Instrumentation.snapshot())
+
+When it is off (the default) each routine only reads Instrumentation.ENABLED once, so the cost is one global
+flag check per call.
+
+The compiled kernels behind CryptoKernels.py (which BatchRunner.py uses for modinv, egcd and mod once
+libcryptokernels is built) can't count their loops; they only record "<name>.compiled" calls and time.
+Run with CRYPTOCODES_NO_EXTENSION=1 to get the full counters of the Python versions.
+
+Three kinds of data are kept:
+    counters    name -> int                              e.g. "tonelli_shanks.squarings"
+    values      name -> count / total / min / max        e.g. "crt_stepwise.modulus_bits"
+    timers      name -> calls / total / max seconds      e.g. "tonelli_shanks"
+
+SAMPLING PROFILER
+start_sampling() asks the OS for a SIGPROF signal every `interval` seconds of CPU time and looks at the Python stack
+each time. "self" counts the function that was running, "total" counts every function on the stack. Pass your own
+`hook(frame)` to do something else with the stack. This is Unix only and must be started from the main thread.
+'''
+
+import time
+
+ENABLED = False
+
+clock = time.perf_counter
+
+_counters = {}
+_values = {}
+_timers = {}
+_samples_self = {}
+_samples_total = {}
+
+
+def enable() -> None:
+    global ENABLED
+    ENABLED = True
+
+def disable() -> None:
+    global ENABLED
+    ENABLED = False
+
+def reset() -> None:
+    _counters.clear()
+    _values.clear()
+    _timers.clear()
+    _samples_self.clear()
+    _samples_total.clear()
+
+
+def count(name: str, n: int = 1) -> None:
+    _counters[name] = _counters.get(name, 0) + n
+
+def observe(name: str, value) -> None:
+    entry = _values.get(name)
+    if entry is None:
+        _values[name] = [1, value, value, value]
+    else:
+        entry[0] += 1
+        entry[1] += value
+        if value < entry[2]:
+            entry[2] = value
+        if value > entry[3]:
+            entry[3] = value
+
+def record_time(name: str, start: float) -> None:
+    '''Add the time since `start` (a clock() value) to the timer `name`.'''
+    elapsed = clock() - start
+    entry = _timers.get(name)
+    if entry is None:
+        _timers[name] = [1, elapsed, elapsed]
+    else:
+        entry[0] += 1
+        entry[1] += elapsed
+        if elapsed > entry[2]:
+            entry[2] = elapsed
+
+
+def snapshot() -> dict:
+    '''A copy of everything recorded so far, ready for json.dumps.'''
+    return {
+        "counters": dict(_counters),
+        "values": {name: {"count": c, "mean": total / c, "min": lo, "max": hi}
+                   for name, (c, total, lo, hi) in _values.items()},
+        "timers": {name: {"calls": c, "total_s": total, "mean_s": total / c, "max_s": hi}
+                   for name, (c, total, hi) in _timers.items()},
+        "samples": {"self": dict(_samples_self), "total": dict(_samples_total)},
+    }
+
+
+# --- sampling profiler ---
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})"
+
+def record_sample(frame) -> None:
+    '''Default sampling hook: count the running function ("self") and every function on the stack ("total").'''
+    if frame is None:
+        return
+    name = _frame_name(frame)
+    _samples_self[name] = _samples_self.get(name, 0) + 1
+    seen = set()
+    while frame is not None:
+        name = _frame_name(frame)
+        if name not in seen:
+            seen.add(name)
+            _samples_total[name] = _samples_total.get(name, 0) + 1
+        frame = frame.f_back
+
+def start_sampling(interval: float = 0.005, hook=None) -> None:
+    import signal
+    hook = hook or record_sample
+    signal.signal(signal.SIGPROF, lambda signum, frame: hook(frame))
+    signal.setitimer(signal.ITIMER_PROF, interval, interval)
+
+def stop_sampling() -> None:
+    import signal
+    signal.setitimer(signal.ITIMER_PROF, 0, 0)
+    signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+
+def main() -> None:
+    import json
+    import random
+    import cryptocodes
+    import Instrumentation      # run as a script this file is __main__; the routines check the imported module
+
+    Instrumentation.enable()
+    Instrumentation.start_sampling()
+    rng = random.Random(0)
+    p = 2**255 - 19                          # p ≡ 5 mod 8, so Tonelli-Shanks takes its general path
+    for _ in range(200):
+        cryptocodes.tonelli_shanks(pow(rng.randrange(2, p), 2, p), p)
+    moduli = [3, 5, 7, 11, 13, 17, 19, 23, 29, 31]
+    for _ in range(200):
+        cryptocodes.crt_stepwise([rng.randrange(n) for n in moduli], moduli)
+        cryptocodes.modinv(rng.randrange(1, 65521), 65521)
+    Instrumentation.stop_sampling()
+    print(json.dumps(Instrumentation.snapshot(), indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,345 @@
+'''
+A compact binary file for large lists of integers, with an mmap reader.
+
+The inputs of the challenges are Python list literals in decimal text (`Modular Arithmetic/output.txt`, or the
+`p = ...` / `ints = [...]` files read by LegendreSymbol.load_input). Turning that text back into ints costs more
+than the Legendre symbols themselves, and reading the whole file (and eval-ing it) needs memory for the text AND
+the list. Here every number is stored in binary, in the same number of bytes, so the reader can jump straight to
+the i-th number and never parses anything.
+
+FILE FORMAT (everything little-endian)
+    header (32 bytes):
+        magic          4 bytes    b"INTA"
+        version        1 byte     1
+        flags          1 byte     bit 0: a modulus follows the header
+        limbs          2 bytes    64-bit limbs per number
+        bits           4 bytes    every number is < 2^bits  (bits <= 64 * limbs)
+        count          8 bytes    how many numbers
+        modulus limbs  4 bytes    size of the modulus (0 when there is none)
+        (unused)       8 bytes
+    modulus:  `modulus limbs` 64-bit limbs, lowest first (e.g. the p the numbers are taken modulo)
+    data:     `count` numbers of `limbs` 64-bit limbs each, lowest limb first
+
+The data always starts at a multiple of 8 bytes, so with 64-bit numbers (limbs = 1) the reader hands out the data
+as a NumPy uint64 array that points into the mmap'ed file: no copy, no parsing, and the OS only reads the pages
+that are used. Wider numbers come out as Python ints, one at a time.
+
+Converting from the text formats is streaming too: the file is read in blocks and the numbers are picked out with
+a regex, so a converter never holds more than one block of text.
+
+Usage:
+    python IntArrayFile.py convert "Modular Arithmetic/output.txt" ct.bin --modulus 1007621497415251
+    python IntArrayFile.py convert input.txt ints.bin --name ints --modulus-name p      # LegendreSymbol format
+    python IntArrayFile.py info ints.bin
+    python IntArrayFile.py legendre ints.bin          # Legendre symbols modulo the file's modulus
+    python IntArrayFile.py sqrt ints.bin              # Tonelli-Shanks roots modulo the file's modulus
+    python IntArrayFile.py crt r3.bin r5.bin r7.bin   # CRT of the i-th numbers of every file (one modulus each)
+'''
+
+import argparse
+import contextlib
+import mmap
+import re
+import struct
+import sys
+from array import array
+
+import cryptocodes
+
+MAGIC = b"INTA"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHIQI8x")
+HAS_MODULUS = 1
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _limbs(bits: int) -> int:
+    return max(1, (bits + 63) // 64)
+
+
+class IntArrayWriter:
+    '''
+    Writes numbers one by one (or many at a time) without knowing how many there will be;
+    the count in the header is filled in by close().
+    '''
+
+    def __init__(self, path: str, bits: int, modulus: int = None) -> None:
+        self.bits = bits
+        self.limbs = _limbs(bits)
+        self.width = 8 * self.limbs
+        self.modulus = modulus
+        self.count = 0
+        self.file = open(path, "wb")
+        self._write_header()
+        if modulus is not None:
+            self.file.write(modulus.to_bytes(8 * _limbs(modulus.bit_length()), "little"))
+
+    def _write_header(self) -> None:
+        modulus_limbs = _limbs(self.modulus.bit_length()) if self.modulus is not None else 0
+        flags = HAS_MODULUS if self.modulus is not None else 0
+        self.file.write(HEADER.pack(MAGIC, VERSION, flags, self.limbs, self.bits, self.count, modulus_limbs))
+
+    def write(self, value: int) -> None:
+        self.write_many((value,))
+
+    def write_many(self, values) -> None:
+        values = list(values)
+        for v in values:
+            if v < 0 or v >> self.bits:
+                raise ValueError(f"{v} doesn't fit in {self.bits} unsigned bits")
+        if self.limbs == 1:
+            packed = array("Q", values)
+            if sys.byteorder == "big":
+                packed.byteswap()
+            self.file.write(packed.tobytes())
+        else:
+            self.file.write(b"".join(v.to_bytes(self.width, "little") for v in values))
+        self.count += len(values)
+
+    def write_raw(self, data: bytes) -> None:
+        '''Append numbers that are already packed in this file's layout (e.g. from a NumPy array).'''
+        if len(data) % self.width:
+            raise ValueError(f"{len(data)} bytes is not a whole number of {self.width}-byte numbers")
+        self.file.write(data)
+        self.count += len(data) // self.width
+
+    def close(self) -> None:
+        if self.file.closed:
+            return
+        self.file.seek(0)
+        self._write_header()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class IntArrayFile:
+    '''mmap-backed reader; the header fields are attributes (modulus is None when the file has none).'''
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mm) < HEADER.size:
+            raise ValueError(f"{path}: too short for an IntArrayFile header")
+        magic, version, flags, self.limbs, self.bits, self.count, modulus_limbs = HEADER.unpack_from(self.mm)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not an IntArrayFile (magic {magic!r})")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported version {version}")
+
+        self.width = 8 * self.limbs
+        self.offset = HEADER.size + 8 * modulus_limbs
+        self.modulus = None
+        if flags & HAS_MODULUS:
+            self.modulus = int.from_bytes(self.mm[HEADER.size:self.offset], "little")
+        if len(self.mm) < self.offset + self.count * self.width:
+            raise ValueError(f"{path}: truncated, header says {self.count} numbers")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> int:
+        if not -self.count <= i < self.count:
+            raise IndexError("IntArrayFile index out of range")
+        start = self.offset + (i % self.count) * self.width
+        return int.from_bytes(self.mm[start:start + self.width], "little")
+
+    def array(self):
+        '''The numbers as a read-only uint64 NumPy array that shares memory with the file (64-bit numbers only).'''
+        if np is None:
+            raise ImportError("IntArrayFile.array needs NumPy")
+        if self.limbs != 1:
+            raise ValueError(f"{self.bits}-bit numbers don't fit in a uint64 array, iterate over the file instead")
+        return np.frombuffer(self.mm, dtype="<u8", count=self.count, offset=self.offset)
+
+    def raw_chunks(self, numbers: int):
+        '''The packed bytes of `numbers` numbers at a time, as memoryviews into the file.'''
+        view = memoryview(self.mm)[self.offset:self.offset + self.count * self.width]
+        size = numbers * self.width
+        for start in range(0, len(view), size):
+            yield view[start:start + size]
+
+    def chunks(self, numbers: int = 65536):
+        '''Lists of `numbers` Python ints at a time, to feed the *_batch functions.'''
+        for data in self.raw_chunks(numbers):
+            if self.limbs == 1:
+                values = array("Q")
+                values.frombytes(data)
+                if sys.byteorder == "big":
+                    values.byteswap()
+                yield values.tolist()
+            else:
+                w = self.width
+                yield [int.from_bytes(data[i:i + w], "little") for i in range(0, len(data), w)]
+
+    def __iter__(self):
+        for chunk in self.chunks():
+            yield from chunk
+
+    def close(self) -> None:
+        try:
+            self.mm.close()
+        except BufferError:
+            pass    # a NumPy array from array() still points into the file; the mmap closes when it's gone
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# --- converters from the text formats ---
+
+_TOKEN = re.compile(rb"[A-Za-z_]\w*|-?\d+|[\[\]=]")
+_PARTIAL = re.compile(rb"[\w-]*\Z")
+
+def _tokens(path: str, block_size: int = 1 << 20):
+    '''Names, numbers, "[", "]" and "=" of a text file, read block by block.'''
+    with open(path, "rb") as f:
+        tail = b""
+        while block := f.read(block_size):
+            data = tail + block
+            cut = _PARTIAL.search(data).start()     # a token cut in half by the block end waits for the next block
+            yield from (m.group() for m in _TOKEN.finditer(data, 0, cut))
+            tail = data[cut:]
+        yield from (m.group() for m in _TOKEN.finditer(tail))
+
+def iter_list(path: str, name: str = None):
+    '''
+    The numbers (as decimal bytes) of a list literal: the first list in the file when `name` is None
+    (a file like output.txt that is only a list), otherwise the list assigned with `name = [...]`.
+    '''
+    previous = (None, None)
+    tokens = _tokens(path)
+    for token in tokens:
+        if token == b"[" and (name is None or previous == (name.encode(), b"=")):
+            for token in tokens:
+                if token == b"]":
+                    return
+                yield token
+            raise ValueError(f"{path}: list is not closed")
+        previous = (previous[1], token)
+    raise ValueError(f"{path}: no list" + (f" named {name!r}" if name else ""))
+
+def read_scalar(path: str, name: str) -> int:
+    '''The number assigned with `name = ...` (like the p of LegendreSymbol.load_input).'''
+    previous = (None, None)
+    for token in _tokens(path):
+        if previous == (name.encode(), b"=") and token not in (b"[", b"="):
+            return int(token)
+        previous = (previous[1], token)
+    raise ValueError(f"{path}: no number named {name!r}")
+
+def convert(src: str, dst: str, name: str = None, modulus: int = None, modulus_name: str = None) -> IntArrayFile:
+    '''
+    Convert a list literal to an IntArrayFile. Two streaming passes: the first finds the widest number (by
+    comparing the decimal strings, without converting them), the second writes.
+    '''
+    if modulus is None and modulus_name is not None:
+        modulus = read_scalar(src, modulus_name)
+
+    widest = b"0"
+    for token in iter_list(src, name):
+        if token.startswith(b"-"):
+            raise ValueError(f"{src}: negative number {token.decode()}, only unsigned numbers are supported")
+        if (len(token), token) > (len(widest), widest):
+            widest = token
+
+    with IntArrayWriter(dst, int(widest).bit_length(), modulus) as out:
+        batch = []
+        for token in iter_list(src, name):
+            batch.append(int(token))
+            if len(batch) == 65536:
+                out.write_many(batch)
+                batch = []
+        out.write_many(batch)
+    return IntArrayFile(dst)
+
+
+# --- feeding the batch functions ---
+
+def _modulus(f: IntArrayFile, modulus: int = None) -> int:
+    modulus = modulus if modulus is not None else f.modulus
+    if modulus is None:
+        raise ValueError("The file has no modulus, pass one")
+    return modulus
+
+def legendre_symbols(f: IntArrayFile, p: int = None, chunk: int = 65536):
+    '''Legendre symbol of every number modulo p (default: the file's modulus), chunk by chunk.'''
+    p = _modulus(f, p)
+    if np is not None and f.limbs == 1 and p < cryptocodes.ModularArrays.MAX_MODULUS:
+        legendre_symbol_array = cryptocodes.ModularArrays.legendre_symbol_array
+        data = f.array()
+        for start in range(0, f.count, chunk):
+            yield from legendre_symbol_array(data[start:start + chunk], p).tolist()
+        return
+    for values in f.chunks(chunk):
+        yield from cryptocodes.legendre_symbol_batch(values, p)
+
+def square_roots(f: IntArrayFile, p: int = None, chunk: int = 65536):
+    '''tonelli_shanks of every number modulo p (default: the file's modulus); None when there is no root.'''
+    p = _modulus(f, p)
+    for values in f.chunks(chunk):
+        yield from cryptocodes.tonelli_shanks_batch(values, p)
+
+def crt(files: list, chunk: int = 65536):
+    '''
+    (x, N) for the i-th number of every file: file j holds residues modulo its own modulus n_j.
+    All files must hold the same number of residues.
+    '''
+    moduli = [_modulus(f) for f in files]
+    counts = [f.count for f in files]
+    if len(set(counts)) > 1:
+        raise ValueError(f"The files hold different numbers of residues: {', '.join(map(str, counts))}")
+    for columns in zip(*(f.chunks(chunk) for f in files)):
+        yield from cryptocodes.crt_batch(zip(*columns), moduli)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Binary integer array files: convert, inspect, compute.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    conv = sub.add_parser("convert", help="list literal text file -> IntArrayFile")
+    conv.add_argument("src")
+    conv.add_argument("dst")
+    conv.add_argument("--name", help="name of the list (ints = [...]); default: the first list in the file")
+    conv.add_argument("--modulus", type=int, help="modulus to store in the header")
+    conv.add_argument("--modulus-name", help="read the modulus from `name = ...` in the source (e.g. p)")
+    info = sub.add_parser("info")
+    info.add_argument("path")
+    for name in ("legendre", "sqrt"):
+        p = sub.add_parser(name)
+        p.add_argument("path")
+        p.add_argument("--modulus", type=int, help="default: the modulus in the file")
+    c = sub.add_parser("crt")
+    c.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        with convert(args.src, args.dst, args.name, args.modulus, args.modulus_name) as f:
+            print(f"{f.count} numbers of {f.bits} bits ({f.limbs} limb(s) each) -> {args.dst}")
+    elif args.command == "info":
+        with IntArrayFile(args.path) as f:
+            print(f"count={f.count} bits={f.bits} limbs={f.limbs} modulus={f.modulus}")
+    elif args.command == "crt":
+        with contextlib.ExitStack() as stack:
+            files = [stack.enter_context(IntArrayFile(path)) for path in args.paths]
+            for x, _ in crt(files):
+                print(x)
+    else:
+        with IntArrayFile(args.path) as f:
+            results = legendre_symbols(f, args.modulus) if args.command == "legendre" else square_roots(f, args.modulus)
+            for result in results:
+                print(result)
+
+
+if __name__ == '__main__':
+    main()
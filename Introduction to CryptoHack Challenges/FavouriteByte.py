@@ -1,6 +1,22 @@
-from pwn import xor
+import os
+import sys
 
-ciphertext = bytes.fromhex("73626960647f6b206821204f21254f7d694f7624662065622127234f726927756d")
+try:
+    from XOR import xor_bytes as xor
+except ImportError:
+    # run as a script only its own folder is on sys.path; XOR.py lives at the repo root, one folder up
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from XOR import xor_bytes as xor
 
-for i in range(2 ** 8):
-    print(xor(ciphertext, i))
\ No newline at end of file
+CIPHERTEXT = "73626960647f6b206821204f21254f7d694f7624662065622127234f726927756d"
+
+def brute_force(ciphertext: bytes) -> list[bytes]:
+    return [xor(ciphertext, i) for i in range(2 ** 8)]
+
+def main() -> None:
+    for candidate in brute_force(bytes.fromhex(CIPHERTEXT)):
+        print(candidate)
+
+
+if __name__ == '__main__':
+    main()
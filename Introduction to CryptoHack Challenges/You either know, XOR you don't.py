@@ -1,7 +1,23 @@
-from pwn import xor
+import os
+import sys
 
-ciphertext = bytes.fromhex("0e0b213f26041e480b26217f27342e175d0e070a3c5b103e2526217f27342e175d0e077e263451150104")
-key = b'crypto'
+try:
+    from XOR import xor_bytes as xor
+except ImportError:
+    # run as a script only its own folder is on sys.path; XOR.py lives at the repo root, one folder up
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from XOR import xor_bytes as xor
 
-print(xor(ciphertext, key))
-print(xor(ciphertext, 'myXORkey'.encode()))
\ No newline at end of file
+CIPHERTEXT = "0e0b213f26041e480b26217f27342e175d0e070a3c5b103e2526217f27342e175d0e077e263451150104"
+
+def decrypt(ciphertext: bytes, key: bytes) -> bytes:
+    return xor(ciphertext, key)
+
+def main() -> None:
+    ciphertext = bytes.fromhex(CIPHERTEXT)
+    print(decrypt(ciphertext, b'crypto'))
+    print(decrypt(ciphertext, 'myXORkey'.encode()))
+
+
+if __name__ == '__main__':
+    main()
@@ -19,18 +19,33 @@ Once a quadratic residue is identified, we can compute its square root modulo p.
 This formula follows from Fermat's Little Theorem and properties of quadratic residues in modular arithmetic. It's particularly useful when working with very large primes (e.g., 1024-bit or 2048-bit) as often used in cryptographic applications.
 '''
 
-def legendre_symbol(a, p):
+import Memo
+from ModContext import ModContext
+
+@Memo.memoize("legendre_symbol", 2)
+def legendre_symbol(a, p, ctx: ModContext = None):
     """Compute the Legendre symbol (a/p) using Euler's criterion"""
+    if ctx is not None:
+        return ctx.exit(ctx.pow(ctx.enter(a), (p - 1) // 2))
     return pow(a, (p - 1) // 2, p)
 
-def modular_sqrt(a, p):
+def modular_sqrt(a, p, ctx: ModContext = None):
     """Compute the square root of a mod p assuming p ≡ 3 mod 4"""
+    if ctx is not None:
+        return ctx.exit(ctx.pow(ctx.enter(a), (p + 1) // 4))
     return pow(a, (p + 1) // 4, p)
 
-def find_first_residue_sqrt(p, nums):
+def legendre_symbol_batch(nums, p, ctx: ModContext = None):
+    """Legendre symbol of every number in nums, all modulo the same p"""
+    e = (p - 1) // 2
+    if ctx is not None:
+        return [ctx.exit(ctx.pow(ctx.enter(a), e)) for a in nums]
+    return [pow(a, e, p) for a in nums]
+
+def find_first_residue_sqrt(p, nums, ctx: ModContext = None):
     for a in nums:
-        if legendre_symbol(a, p) == 1:
-            root = modular_sqrt(a, p)
+        if legendre_symbol(a, p, ctx) == 1:
+            root = modular_sqrt(a, p, ctx)
             return max(root, p - root)  # return the larger root
     return None
 
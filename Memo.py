@@ -0,0 +1,254 @@
+'''
+Memoization for the pure number-theory functions: modinv, legendre_symbol and moduloCalc.
+
+Batch jobs keep asking for the same (a, m) inverse or the same (a, p) Legendre symbol. These functions always give
+the same answer for the same input, so the answer can be kept and handed back next time instead of being computed
+again. Each function has its own cache, and every cache is OFF by default:
+
+        import Memo
+        Memo.enable("modinv", "legendre_symbol")        # or Memo.enable() for all of them
+        ...
+        print(Memo.stats())
+
+A cache that is off still costs one extra function call (a few hundred nanoseconds) on every call.
+CryptoKernels.modinv and CryptoKernels.moduloCalc (the C versions) share the caches of the Python ones.
+
+EVICTION BY BYTES
+A cache is an LRU (least recently used) cache, but its limit is in BYTES, not in entries: one entry with 4096-bit
+numbers takes about 30 times the memory of one with 64-bit numbers, so "keep 100000 entries" says nothing about
+memory. The size of an entry is the real size of its int objects (sys.getsizeof) plus a fixed overhead for the
+dict slot and the key tuple. When the total goes over max_bytes, the least recently used entries are dropped.
+
+ON-DISK STORE
+Memo.open_store("memo.sqlite") adds a second level behind the in-memory caches, so answers survive between batch
+runs: a miss in memory looks in the file before computing, and every computed answer is written to it. Numbers are
+stored in hex. sqlite3 is only imported when a store is opened. Worker processes forked after open_store() open
+their own connection to the same file.
+
+Switches can also come from the environment, which is handy for BatchRunner.py and its worker processes:
+    CRYPTOCODES_MEMO=modinv,legendre_symbol     (or "all")
+    CRYPTOCODES_MEMO_STORE=memo.sqlite
+'''
+
+import functools
+import os
+import sys
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# dict slot + key tuple + bookkeeping, per entry
+_ENTRY_OVERHEAD = 120
+
+_caches = {}
+_store = None
+_from_environment = {name.strip() for name in os.environ.get("CRYPTOCODES_MEMO", "").split(",")}
+
+
+class MemoCache:
+    '''The LRU cache of one function, bounded by the size of what it holds.'''
+
+    def __init__(self, name: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.name = name
+        self.max_bytes = max_bytes
+        self.enabled = name in _from_environment or "all" in _from_environment
+        self.entries = OrderedDict()     # key tuple -> (value, size)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    def get(self, key):
+        '''(True, value) from memory or the on-disk store, or (False, None).'''
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+        if _store is not None:
+            found, value = _store.get(self.name, key)
+            if found:
+                self.disk_hits += 1
+                self._add(key, value)
+                return True, value
+        self.misses += 1
+        return False, None
+
+    def put(self, key, value) -> None:
+        self._add(key, value)
+        if _store is not None:
+            _store.put(self.name, key, value)
+
+    def _add(self, key, value) -> None:
+        size = _ENTRY_OVERHEAD + sys.getsizeof(value) + sum(sys.getsizeof(k) for k in key)
+        if size > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self.entries[key] = (value, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, dropped) = self.entries.popitem(last=False)
+            self.bytes -= dropped
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else None,
+        }
+
+
+def memoize(name: str, nargs: int):
+    '''
+    Decorator: cache the function under `name`, keyed on its first `nargs` positional arguments.
+    Later arguments (like a ModContext) only change HOW the answer is computed, not the answer.
+    Several functions that give the same answers (modinv and CryptoKernels.modinv) can share one cache.
+    While the cache is disabled the function is called directly.
+    '''
+    if name not in _caches:
+        _caches[name] = MemoCache(name)
+    cache = _caches[name]
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not cache.enabled or len(args) < nargs:
+                return func(*args, **kwargs)
+            key = args[:nargs]
+            found, value = cache.get(key)
+            if not found:
+                value = func(*args, **kwargs)
+                cache.put(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+# the caches exist before their modules are imported, so they can be switched on first
+for _name in ("legendre_symbol", "modinv", "moduloCalc"):
+    _caches[_name] = MemoCache(_name)
+
+
+def _select(names):
+    for name in names or _caches:
+        if name not in _caches:
+            raise KeyError(f"No memoized function {name!r} (known: {', '.join(sorted(_caches))})")
+        yield _caches[name]
+
+def enable(*names: str, max_bytes: int = None) -> None:
+    '''Switch on the caches of the given functions (all of them when no name is given).'''
+    for cache in _select(names):
+        cache.enabled = True
+        if max_bytes is not None:
+            cache.max_bytes = max_bytes
+
+def disable(*names: str) -> None:
+    for cache in _select(names):
+        cache.enabled = False
+
+def clear(*names: str) -> None:
+    for cache in _select(names):
+        cache.clear()
+
+def stats() -> dict:
+    return {name: cache.stats() for name, cache in sorted(_caches.items())}
+
+
+# --- on-disk store ---
+
+def _encode(values) -> str:
+    return ",".join(format(v, "x") for v in values)
+
+class SqliteStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.pid = None
+        self.db = None
+
+    def _connect(self):
+        # a connection must not be shared with a forked child, so every process opens its own
+        if self.pid != os.getpid():
+            import sqlite3
+            self.db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS memo "
+                            "(func TEXT, key TEXT, value TEXT, PRIMARY KEY (func, key))")
+            self.pid = os.getpid()
+        return self.db
+
+    def get(self, name: str, key: tuple):
+        row = self._connect().execute("SELECT value FROM memo WHERE func = ? AND key = ?",
+                                      (name, _encode(key))).fetchone()
+        if row is None:
+            return False, None
+        return True, int(row[0], 16)
+
+    def put(self, name: str, key: tuple, value) -> None:
+        if isinstance(value, int):
+            self._connect().execute("INSERT OR REPLACE INTO memo VALUES (?, ?, ?)",
+                                    (name, _encode(key), format(value, "x")))
+
+    def close(self) -> None:
+        if self.db is not None and self.pid == os.getpid():
+            self.db.close()
+        self.db = None
+        self.pid = None
+
+def open_store(path: str) -> None:
+    global _store
+    close_store()
+    _store = SqliteStore(path)
+
+def close_store() -> None:
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
+
+
+if os.environ.get("CRYPTOCODES_MEMO_STORE"):
+    open_store(os.environ["CRYPTOCODES_MEMO_STORE"])
+
+
+def main() -> None:
+    import random
+    import timeit
+    import cryptocodes
+    import Memo     # run as a script this file is __main__; the decorators registered in the imported module
+
+    rng = random.Random(0)
+    p = (1 << 127) - 1
+    pairs = [(rng.randrange(1, 2000), p) for _ in range(20000)]     # lots of repeats, like real traffic
+
+    def run():
+        for a, m in pairs:
+            cryptocodes.legendre_symbol(a, m)
+
+    off = min(timeit.repeat(run, number=1, repeat=3))
+    Memo.enable("legendre_symbol")
+    on = min(timeit.repeat(run, number=1, repeat=3))
+    print(f"legendre_symbol on {len(pairs)} calls: {off * 1000:.1f} ms uncached, {on * 1000:.1f} ms cached")
+    print(Memo.stats()["legendre_symbol"])
+
+
+if __name__ == '__main__':
+    main()
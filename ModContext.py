@@ -0,0 +1,158 @@
+'''
+Most of the algorithms in this repo (Tonelli-Shanks, the Legendre symbol, Fermat inverses, ...) do long chains of
+multiplications modulo the SAME number p:
+
+        r = (r * b) % p
+        c = (b * b) % p
+        t = (t * c) % p
+
+Every `%` is a full big-integer division. Because p never changes inside the loop, we can precompute a few
+constants once and replace the division with cheaper operations. There are two classic ways to do that:
+
+1. Montgomery reduction
+-----------------------
+Pick R = 2^k > p (p must be odd). Instead of working with x we work with its "Montgomery form" x * R mod p.
+Multiplying two numbers in that form gives x * y * R^2, and we only need to divide by R once, which is a shift:
+
+        t = a * b
+        u = (t + ((t * p') mod R) * p) / R          where p' = -p^(-1) mod R
+        if u >= p: u -= p
+
+Entering the form costs one multiplication (x * R mod p), leaving it costs one reduction.
+
+2. Barrett reduction
+--------------------
+Precompute mu = floor(4^k / p). Then floor(t / p) is approximated with shifts and one multiplication:
+
+        q = ((t >> (k - 1)) * mu) >> (k + 1)
+        r = t - q * p                                  (0 <= r < 3p, so at most two subtractions)
+
+Barrett works directly on normal residues, no special form is needed.
+
+WHICH ONE IS FASTER IN PYTHON?
+In C both tricks beat division. In CPython the story is different: `%` runs entirely in C, while Montgomery and
+Barrett need 2-3 extra big-int operations that each go through the interpreter. Run ModContextBenchmark.py to see
+it on your machine; on ours plain `%` is clearly fastest at 64 and 256 bits, and at 2048 bits all three are within
+a few percent of each other (the multiplication itself dominates).
+That is why method="auto" picks plain `%`, and why pow() and inv() always hand the work to the built-in pow().
+The other methods are still here so you can measure them (and because they are what you want in C).
+
+Usage:
+        ctx = ModContext(p)
+        x = ctx.enter(a)            # convert into the context representation
+        y = ctx.mul(x, x)           # ... work inside the context ...
+        print(ctx.exit(y))          # convert back to a normal residue
+'''
+
+METHODS = ("plain", "montgomery", "barrett")
+
+
+class ModContext:
+    def __init__(self, p: int, method: str = "auto") -> None:
+        if p <= 1:
+            raise ValueError("Modulus must be greater than 1.")
+        if method == "auto":
+            method = "plain"
+        if method not in METHODS:
+            raise ValueError(f"Unknown reduction method: {method}")
+        if method == "montgomery" and p % 2 == 0:
+            raise ValueError("Montgomery reduction needs an odd modulus.")
+
+        self.p = p
+        self.method = method
+        self.k = p.bit_length()
+
+        if method == "montgomery":
+            self.R = 1 << self.k
+            self.mask = self.R - 1
+            self.p_prime = (-pow(p, -1, self.R)) & self.mask
+            self.R2 = (self.R * self.R) % p
+            self.reduce = self._montgomery_reduce
+        elif method == "barrett":
+            self.mu = (1 << (2 * self.k)) // p
+            self.reduce = self._barrett_reduce
+        else:
+            self.reduce = self._plain_reduce
+
+        self.one = self.enter(1)
+        self.minus_one = self.enter(p - 1)
+
+    def __repr__(self) -> str:
+        return f"ModContext(p={self.p}, method={self.method!r})"
+
+    # --- reductions: t must be in [0, p^2) ---
+
+    def _plain_reduce(self, t: int) -> int:
+        return t % self.p
+
+    def _montgomery_reduce(self, t: int) -> int:
+        u = (t + (((t & self.mask) * self.p_prime) & self.mask) * self.p) >> self.k
+        return u - self.p if u >= self.p else u
+
+    def _barrett_reduce(self, t: int) -> int:
+        r = t - (((t >> (self.k - 1)) * self.mu) >> (self.k + 1)) * self.p
+        while r >= self.p:
+            r -= self.p
+        return r
+
+    # --- conversion ---
+
+    def enter(self, x: int) -> int:
+        '''Convert a normal integer into the context representation.'''
+        x %= self.p
+        if self.method == "montgomery":
+            return self._montgomery_reduce(x * self.R2)
+        return x
+
+    def exit(self, x: int) -> int:
+        '''Convert a value in the context representation back to a residue in [0, p).'''
+        if self.method == "montgomery":
+            return self._montgomery_reduce(x)
+        return x
+
+    # --- arithmetic on context values ---
+
+    def add(self, x: int, y: int) -> int:
+        s = x + y
+        return s - self.p if s >= self.p else s
+
+    def sub(self, x: int, y: int) -> int:
+        d = x - y
+        return d + self.p if d < 0 else d
+
+    def neg(self, x: int) -> int:
+        return self.p - x if x else 0
+
+    def mul(self, x: int, y: int) -> int:
+        return self.reduce(x * y)
+
+    def sqr(self, x: int) -> int:
+        return self.reduce(x * x)
+
+    def pow(self, x: int, e: int) -> int:
+        '''x^e; the exponentiation itself is done by the built-in pow(), which is always faster in CPython.'''
+        if self.method == "plain":
+            return pow(x, e, self.p)
+        return self.enter(pow(self.exit(x), e, self.p))
+
+    def inv(self, x: int) -> int:
+        '''x^(-1); raises ValueError when x is not invertible modulo p.'''
+        if self.method == "plain":
+            return pow(x, -1, self.p)
+        return self.enter(pow(self.exit(x), -1, self.p))
+
+
+def main() -> None:
+    p = int(input("Enter modulus p: "))
+    a = int(input("Enter a: "))
+    b = int(input("Enter b: "))
+    for method in METHODS:
+        if method == "montgomery" and p % 2 == 0:
+            continue
+        ctx = ModContext(p, method)
+        x, y = ctx.enter(a), ctx.enter(b)
+        print(f"{method:>10}: a * b = {ctx.exit(ctx.mul(x, y))}, a^-1 = {ctx.exit(ctx.inv(x))}")
+
+
+if __name__ == '__main__':
+    main()
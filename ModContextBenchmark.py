@@ -0,0 +1,117 @@
+'''
+Microbenchmark for ModContext.py: how much do Montgomery and Barrett reduction actually buy us in CPython
+compared to a plain `%`?
+
+For each modulus size (64, 256 and 2048 bits) and each reduction method we time:
+    - mul chain:      x = x * y mod p, repeated
+    - sqr chain:      x = x * x mod p, repeated
+    - tonelli_shanks: a full modular square root (p ≡ 1 mod 4 prime, so the main loop really runs)
+
+Times are the best of several runs, in microseconds per operation. The fastest method in each row is marked.
+'''
+
+import importlib.util
+import os
+import random
+import timeit
+from math import gcd
+
+from ModContext import ModContext, METHODS
+
+_spec = importlib.util.spec_from_file_location(
+    "ModularSquareRoot", os.path.join(os.path.dirname(os.path.abspath(__file__)), "Modular-Square-Root.py"))
+_msr = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_msr)
+tonelli_shanks = _msr.tonelli_shanks
+
+BIT_SIZES = (64, 256, 2048)
+CHAIN = 1000
+REPEAT = 5
+
+
+def is_probable_prime(n: int, rounds: int = 20) -> bool:
+    '''Miller-Rabin; good enough to pick benchmark moduli.'''
+    if n < 4:
+        return n in (2, 3)
+    if n % 2 == 0:
+        return False
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for _ in range(rounds):
+        x = pow(random.randrange(2, n - 1), d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+# product of the odd primes below 1000, to throw away most candidates with one gcd before Miller-Rabin
+_SMALL_PRIMES = 1
+for _n in range(3, 1000, 2):
+    if all(_n % _d for _d in range(3, int(_n ** 0.5) + 1, 2)):
+        _SMALL_PRIMES *= _n
+
+
+def random_prime(bits: int, rng=random) -> int:
+    '''Random prime p ≡ 1 mod 8 with the top bit set (p ≡ 1 mod 4 forces the general Tonelli-Shanks path).'''
+    while True:
+        p = rng.getrandbits(bits) | (1 << (bits - 1))
+        p = p - (p % 8) + 1
+        if p.bit_length() != bits:
+            continue
+        if p > 1000 and gcd(p, _SMALL_PRIMES) != 1:
+            continue
+        if is_probable_prime(p, rounds=5):
+            return p
+
+
+def bench_chain(ctx: ModContext, square: bool) -> float:
+    x = ctx.enter(random.randrange(2, ctx.p))
+    y = ctx.enter(random.randrange(2, ctx.p))
+    mul, sqr = ctx.mul, ctx.sqr
+
+    def run():
+        v = x
+        if square:
+            for _ in range(CHAIN):
+                v = sqr(v)
+        else:
+            for _ in range(CHAIN):
+                v = mul(v, y)
+        return v
+
+    return min(timeit.repeat(run, number=1, repeat=REPEAT)) / CHAIN * 1e6
+
+
+def bench_tonelli(ctx: ModContext, residue: int) -> float:
+    return min(timeit.repeat(lambda: tonelli_shanks(residue, ctx.p, ctx), number=1, repeat=REPEAT)) * 1e6
+
+
+def main() -> None:
+    random.seed(2024)
+    print(f"{'bits':>5} {'operation':>15} " + " ".join(f"{m:>12}" for m in METHODS))
+    for bits in BIT_SIZES:
+        p = random_prime(bits)
+        residue = pow(random.randrange(2, p), 2, p)
+        contexts = [ModContext(p, m) for m in METHODS]
+        rows = (
+            ("mul chain", [bench_chain(ctx, square=False) for ctx in contexts]),
+            ("sqr chain", [bench_chain(ctx, square=True) for ctx in contexts]),
+            ("tonelli_shanks", [bench_tonelli(ctx, residue) for ctx in contexts]),
+        )
+        for name, times in rows:
+            best = min(times)
+            cells = " ".join(f"{t:>11.3f}{'*' if t == best else ' '}" for t in times)
+            print(f"{bits:>5} {name:>15} {cells}")
+    print("\n(microseconds per operation, * = fastest)")
+
+
+if __name__ == '__main__':
+    main()
@@ -20,4 +20,9 @@ def encrypt_flag(flag):
     return ciphertext
 
 
-print(encrypt_flag(FLAG))
+def main():
+    print(encrypt_flag(FLAG))
+
+
+if __name__ == '__main__':
+    main()
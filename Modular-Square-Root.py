@@ -76,15 +76,25 @@ Step-by-step process:
 The Tonelli-Shanks algorithm runs in O(log^2 p) time and is efficient even with large 2048-bit primes.
 '''
 
-def legendre_symbol(a, p):
-    return pow(a, (p - 1) // 2, p)
+import Instrumentation
+from ModContext import ModContext
 
-def tonelli_shanks(a, p):
-    if legendre_symbol(a, p) != 1:
-        return None
+def legendre_symbol(a, p, ctx: ModContext = None):
+    if ctx is not None:
+        return ctx.exit(ctx.pow(ctx.enter(a), (p - 1) // 2))
+    return pow(a, (p - 1) // 2, p)
 
+def tonelli_setup(p, ctx: ModContext = None):
+    '''
+    The part of Tonelli-Shanks that only depends on p: p - 1 = q * 2^s and c = z^q for a non-residue z.
+    Returns None when p ≡ 3 mod 4 (the shortcut formula needs none of it).
+    With a ctx, c is in ctx's representation, so the setup must be used with that same ctx.
+    Raises ValueError for an even p or p < 3, and when no non-residue shows up below p (p is not a prime).
+    '''
     if p % 4 == 3:
-        return pow(a, (p + 1) // 4, p)
+        return None
+    if p < 3 or p % 2 == 0:
+        raise ValueError(f"Tonelli-Shanks needs an odd prime p, got {p}")
 
     q, s = p - 1, 0
     while q % 2 == 0:
@@ -92,30 +102,134 @@ def tonelli_shanks(a, p):
         s += 1
 
     z = 2
-    while legendre_symbol(z, p) != p - 1:
+    while legendre_symbol(z, p, ctx) != p - 1:
         z += 1
+        if z >= p:
+            raise ValueError(f"No quadratic non-residue modulo {p}; p is not a prime")
+    if Instrumentation.ENABLED:
+        Instrumentation.count("tonelli_setup.calls")
+        Instrumentation.observe("tonelli_setup.nonresidue_candidates", z - 1)
+        Instrumentation.observe("tonelli_setup.s", s)
+        # z - 1 Legendre symbols (one per candidate), and c = z^q
+        Instrumentation.count("tonelli_shanks.exponentiations", z)
+
+    if ctx is None:
+        return q, s, pow(z, q, p)
+    return q, s, ctx.pow(ctx.enter(z), q)
+
+def tonelli_shanks(a, p, ctx: ModContext = None, setup=None):
+    '''
+    With a `ctx` (see ModContext.py) all arithmetic modulo p goes through it, so the same algorithm runs
+    with plain `%`, Montgomery or Barrett reduction. Without one, plain pow and `%` are used directly.
+    `setup` is the result of tonelli_setup(p, ctx), to share it between many roots modulo the same p.
+    '''
+    stats = Instrumentation.ENABLED
+    if stats:
+        start = Instrumentation.clock()
+        Instrumentation.observe("tonelli_shanks.p_bits", p.bit_length())
+
+    try:
+        if ctx is not None:
+            return _tonelli_shanks_ctx(a, p, ctx, setup, stats)
+
+        if stats:
+            Instrumentation.count("tonelli_shanks.exponentiations")     # the Legendre symbol
+        if legendre_symbol(a, p) != 1:
+            return None
+
+        if p % 4 == 3:
+            if stats:
+                Instrumentation.count("tonelli_shanks.shortcut")
+                Instrumentation.count("tonelli_shanks.exponentiations")
+            return pow(a, (p + 1) // 4, p)
+
+        q, s, c = setup if setup is not None else tonelli_setup(p)
+        if stats:
+            Instrumentation.count("tonelli_shanks.exponentiations", 2)
+
+        m = s
+        t = pow(a, q, p)
+        r = pow(a, (q + 1) // 2, p)
+
+        while t != 1:
+            i, temp = 0, t
+            while temp != 1:
+                temp = pow(temp, 2, p)
+                i += 1
+                if i == m:
+                    return None
+
+            b = pow(c, 2 ** (m - i - 1), p)
+            r = (r * b) % p
+            c = (b * b) % p
+            t = (t * c) % p
+            if stats:
+                Instrumentation.count("tonelli_shanks.iterations")
+                Instrumentation.count("tonelli_shanks.squarings", i + 1)
+                Instrumentation.count("tonelli_shanks.exponentiations")
+            m = i
+
+        return min(r, p - r)
+    finally:
+        if stats:
+            Instrumentation.record_time("tonelli_shanks", start)
+
+def _tonelli_shanks_ctx(a, p, ctx: ModContext, setup, stats: bool):
+    '''tonelli_shanks with every operation modulo p done by ctx.'''
+    if stats:
+        Instrumentation.count("tonelli_shanks.exponentiations")     # the Legendre symbol
+    if legendre_symbol(a, p, ctx) != 1:
+        return None
+
+    a = ctx.enter(a)
+    if p % 4 == 3:
+        if stats:
+            Instrumentation.count("tonelli_shanks.shortcut")
+            Instrumentation.count("tonelli_shanks.exponentiations")
+        return ctx.exit(ctx.pow(a, (p + 1) // 4))
+
+    q, s, c = setup if setup is not None else tonelli_setup(p, ctx)
+    if stats:
+        Instrumentation.count("tonelli_shanks.exponentiations", 2)
 
     m = s
-    c = pow(z, q, p)
-    t = pow(a, q, p)
-    r = pow(a, (q + 1) // 2, p)
+    t = ctx.pow(a, q)
+    r = ctx.pow(a, (q + 1) // 2)
 
-    while t != 1:
+    while t != ctx.one:
         i, temp = 0, t
-        while temp != 1:
-            temp = pow(temp, 2, p)
+        while temp != ctx.one:
+            temp = ctx.sqr(temp)
             i += 1
             if i == m:
                 return None
 
-        b = pow(c, 2 ** (m - i - 1), p)
-        r = (r * b) % p
-        c = (b * b) % p
-        t = (t * c) % p
+        b = ctx.pow(c, 2 ** (m - i - 1))
+        r = ctx.mul(r, b)
+        c = ctx.sqr(b)
+        t = ctx.mul(t, c)
+        if stats:
+            Instrumentation.count("tonelli_shanks.iterations")
+            Instrumentation.count("tonelli_shanks.squarings", i + 1)
+            Instrumentation.count("tonelli_shanks.exponentiations")
         m = i
 
+    r = ctx.exit(r)
     return min(r, p - r)
 
+def tonelli_shanks_batch(values, p, ctx: ModContext = None):
+    '''
+    Square roots of many numbers modulo the same p; the non-residue search is done only once.
+    It is done for the first number that has a root, so a batch without roots never needs it (like tonelli_shanks).
+    '''
+    setup = None
+    results = []
+    for a in values:
+        if setup is None and p % 4 == 1 and legendre_symbol(a, p, ctx) == 1:
+            setup = tonelli_setup(p, ctx)
+        results.append(tonelli_shanks(a, p, ctx, setup))
+    return results
+
 def load_input(filename):
     a = None
     p = None
@@ -34,22 +34,19 @@ int main(void){
 
 long long moduloCalc(long long x, long long m){
     // This function calculates the value of Y in X ≡ Y mod m
-    if (x == 0) return 0;
-    
-    long long current = 0;
-    long long reversed = 0;
-    long long temp = x;
+    // The digits are collected first and then read from left to right: reversing the number instead would
+    // drop its trailing zeros (100 would become 1)
+    char digits[20];
+    int n = 0;
 
-    while (temp > 0){
-        reversed = reversed * 10 + (temp % 10);
-        temp /= 10;
-    }
+    do {
+        digits[n++] = (char)(x % 10);
+        x /= 10;
+    } while (x > 0);
 
-    while (reversed > 0){
-        long long digit = reversed % 10;
-        current = (current * 10 + digit) % m;
-        reversed /= 10;
+    long long current = 0;
+    while (n > 0){
+        current = (current * 10 + digits[--n]) % m;
     }
-    
     return current;
 }
\ No newline at end of file
@@ -17,6 +17,9 @@ At the end, current will hold the remainder X
 NB: digits should be access from left to right
 '''
 
+import Memo
+
+@Memo.memoize("moduloCalc", 2)
 def moduloCalc(X: int, m: int) -> int:
     '''
     This function calculates the value of Y in X ≡ Y mod m
@@ -118,15 +118,14 @@ uint64_t mod_exp(uint64_t base, uint64_t exponent, uint64_t modulus){
     *
     * Never compromise precision in cryptographic applications.
     */
-    __uint128_t result = 1;
-
-    base %= modulus;
+    __uint128_t result = 1 % modulus;
+    __uint128_t current = base % modulus;     // 128 bits too, or current * current overflows for base >= 2^32
 
     while (exponent > 0) {
         if (exponent & 1) {
-            result = (result * base) % modulus;
+            result = (result * current) % modulus;
         }
-        base = (base * base) % modulus;
+        current = (current * current) % modulus;
         exponent >>= 1;
     }
 
@@ -61,7 +61,11 @@ ntial for the efficiency of public-key cryptographic systems like RSA.
 BY ChatGPT
 '''
 
-def mod_exp(base, exponent, modulus):
+from ModContext import ModContext
+
+def mod_exp(base, exponent, modulus, ctx: ModContext = None):
+    if ctx is not None:
+        return ctx.exit(ctx.pow(ctx.enter(base), exponent))
     return pow(base, exponent, modulus)
 
 
@@ -0,0 +1,168 @@
+'''
+Vectorized modular arithmetic with NumPy for word-size moduli.
+
+The scalar functions in this repo (mod_exp, legendre_symbol, modinv, moduloCalc) take one Python int at a time.
+When you have a million numbers that all use the same modulus, the interpreter overhead of calling them one by
+one is most of the cost. Here every function takes a whole array and does the work with NumPy.
+
+THE PROBLEM: a * b OVERFLOWS
+----------------------------
+NumPy's biggest integer is 64 bits, and a * b with a, b < m needs 2 * bits(m) bits. Two cases are handled:
+
+1. m < 2^32
+   a * b < 2^64, so the product fits in a uint64 and we simply do (a * b) % m.
+
+2. 2^32 <= m < 2^51 (this covers p = 1007621497415251 from Adrien's Signs)
+   We compute the quotient with floating point and the remainder with wrapping 64-bit integers:
+
+        q = floor(float(a) * float(b) / m)          (off by at most 1, because m < 2^51)
+        r = a * b - q * m                             (computed mod 2^64, the overflow cancels out)
+
+   The true remainder is in [0, m), so r lands in [-m, 2m) and one correction step fixes it.
+   Above 2^51 the floating point quotient can be off by more, so those moduli are refused.
+
+Montgomery multiplication was tried for case 1 as well, but NumPy's `%` by a scalar is already fast and beat it,
+so case 1 stays a plain `%`.
+
+All results are exactly the ones the scalar functions return: legendre_symbol_array gives p - 1 (not -1) for
+non-residues, just like legendre_symbol, and modinv_array uses Fermat for prime moduli and the Euclid loop
+otherwise, just like modinv.
+'''
+
+import numpy as np
+
+from ModularInverting_MultiplicativeInverse import is_prime
+
+MAX_MODULUS = 1 << 51
+_DIRECT_LIMIT = 1 << 32
+
+
+def _check_modulus(m: int) -> None:
+    if not 1 <= m < MAX_MODULUS:
+        raise ValueError(f"Modulus must be in [1, 2^51), got {m}")
+
+
+def _as_uint64(x) -> np.ndarray:
+    x = np.asarray(x)
+    if x.dtype.kind == "i" and x.size and x.min() < 0:
+        raise ValueError("Array values must be non-negative.")
+    return x.astype(np.uint64, copy=False)
+
+
+def mulmod(a: np.ndarray, b: np.ndarray, m: int) -> np.ndarray:
+    '''(a * b) % m element-wise; a and b must already be reduced (< m).'''
+    m64 = np.uint64(m)
+    if m < _DIRECT_LIMIT:
+        return (a * b) % m64
+
+    q = np.floor(a.astype(np.float64) * b.astype(np.float64) / float(m)).astype(np.uint64)
+    r = a * b
+    r -= q * m64
+    # r is in [-m, 2m) as a wrapped uint64; "negative" values are huge, so min() picks the right one
+    r = np.minimum(r, r + m64)
+    return np.minimum(r, r - m64)
+
+
+def reduce_array(X, m: int) -> np.ndarray:
+    '''Vectorized moduloCalc: X mod m for every element of X.'''
+    if m < 1:
+        raise ValueError(f"Modulus must be positive, got {m}")
+    return _as_uint64(X) % np.uint64(m)
+
+
+def mod_exp_array(bases, exponent, modulus: int) -> np.ndarray:
+    '''
+    Vectorized mod_exp: bases ^ exponent mod modulus.
+    `exponent` can be one int shared by all bases, or an array with one exponent per base.
+    '''
+    _check_modulus(modulus)
+    base = _as_uint64(bases) % np.uint64(modulus)
+
+    if np.ndim(exponent) == 0:
+        exponent = int(exponent)
+        if exponent < 0:
+            raise ValueError("Negative exponents are not supported, use modinv_array.")
+        result = np.full(base.shape, 1 % modulus, dtype=np.uint64)
+        while exponent > 0:
+            if exponent & 1:
+                result = mulmod(result, base, modulus)
+            base = mulmod(base, base, modulus)
+            exponent >>= 1
+        return result
+
+    exponent = _as_uint64(exponent)
+    base, exponent = np.broadcast_arrays(base, exponent)
+    result = np.full(base.shape, 1 % modulus, dtype=np.uint64)
+    exponent = exponent.copy()
+    while exponent.any():
+        odd = (exponent & np.uint64(1)).astype(bool)
+        result = np.where(odd, mulmod(result, base, modulus), result)
+        base = mulmod(base, base, modulus)
+        exponent >>= np.uint64(1)
+    return result
+
+
+def legendre_symbol_array(a, p: int) -> np.ndarray:
+    '''Vectorized legendre_symbol: a^((p-1)/2) mod p, so 1, p - 1 or 0 for every element.'''
+    return mod_exp_array(a, (p - 1) // 2, p)
+
+
+def modinv_euclid_array(a, m: int) -> np.ndarray:
+    '''Vectorized modinv_euclid; runs the same loop on every element, masking out the finished ones.'''
+    _check_modulus(m)
+    if m == 1:
+        return np.zeros(np.shape(a), dtype=np.uint64)
+
+    # The first step (a, m = m, a % m) is done in uint64, so numbers >= 2^63 aren't wrapped to negative int64;
+    # its quotient only multiplies x0 = 0, so it isn't needed. After it everything is < m < 2^51.
+    a = _as_uint64(a)
+    first = a > 1
+    a, mod = np.where(first, m, a).astype(np.int64), np.where(first, a % np.uint64(m), m).astype(np.int64)
+    x0 = first.astype(np.int64)
+    x1 = (~first).astype(np.int64)
+
+    active = a > 1
+    while active.any():
+        if (mod[active] == 0).any():
+            raise ZeroDivisionError("No modular inverse: gcd(a, m) != 1")
+        safe = np.where(active, mod, 1)
+        q = a // safe
+        a, mod = np.where(active, mod, a), np.where(active, a % safe, mod)
+        x0, x1 = np.where(active, x1 - q * x0, x0), np.where(active, x0, x1)
+        active = a > 1
+    return (x1 % m).astype(np.uint64)
+
+
+def modinv_array(a, m: int) -> np.ndarray:
+    '''Vectorized modinv: Fermat's little theorem when m is prime, the Euclid loop otherwise.'''
+    _check_modulus(m)
+    if is_prime(m):
+        return mod_exp_array(a, m - 2, m)
+    return modinv_euclid_array(a, m)
+
+
+def main() -> None:
+    import time
+    from ModularArithmetic2 import mod_exp
+    from LegendreSymbol import legendre_symbol
+
+    p = 1007621497415251
+    n = int(input("Number of elements: "))
+    values = np.random.default_rng(0).integers(1, p, size=n, dtype=np.uint64)
+
+    start = time.perf_counter()
+    vectorized = legendre_symbol_array(values, p)
+    vector_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scalar = [legendre_symbol(int(v), p) for v in values]
+    scalar_time = time.perf_counter() - start
+
+    print(f"Results match: {vectorized.tolist() == scalar}")
+    print(f"Scalar:     {scalar_time:.3f} s")
+    print(f"Vectorized: {vector_time:.3f} s ({scalar_time / vector_time:.1f}x)")
+    print(f"mod_exp check: {int(mod_exp_array(values[:1], 65537, p)[0]) == mod_exp(int(values[0]), 65537, p)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -51,7 +51,7 @@ bool isPrime(uint64_t n){
     if (n <= 3) return true;
     if (n % 2 == 0 || n % 3 == 0) return false;
     uint64_t i = 5;
-    while (i * i <= n){
+    while (i <= n / i){     // i * i would overflow for n close to 2^64
         if (n % i == 0 || n % (i + 2) == 0) return false;
         i += 6;
     }
@@ -94,24 +94,24 @@ uint64_t mod_exp(uint64_t base, uint64_t exponent, uint64_t modulus){
 }
 
 uint64_t modinv_euclid(uint64_t a, uint64_t m){
-    uint64_t m0, x0, x1;
-    m0 = m;
-    x0 = 0;
-    x1 = 1;
+    // the coefficients go negative, so they must be signed (unsigned ones wrap around)
+    uint64_t m0 = m;
+    long long x0 = 0, x1 = 1;
     if (m == 1) return 0;
 
-    uint64_t q;
     while (a > 1){
-        q = a / m;
+        uint64_t q = a / m;
         uint64_t temp = m;
         m = a % m;
         a = temp;
 
-        uint64_t tempX = x0;
-        x0 = x1 - q * x0;
+        long long tempX = x0;
+        x0 = x1 - (long long)q * x0;
         x1 = tempX;
     }
-    return x1 % m0;
+    // bring the result back into [0, m) like Python's %
+    long long r = x1 % (long long)m0;
+    return (uint64_t)(r < 0 ? r + (long long)m0 : r);
 }
 
 uint64_t modinv(uint64_t a, uint64_t m){
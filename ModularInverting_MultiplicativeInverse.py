@@ -12,18 +12,34 @@ which is otherwise not directly defined.
 NB: if the GCD is not 1, then there is no multiplicative inverse.
 '''
 
+from math import gcd
+
+import Instrumentation
+import Memo
 from EuclideanAlgorithm import GCDRecursive
 
 def is_prime(n: int) -> bool:
-    if n <= 1: return False
-    if n <= 3: return True
-    if n % 2 == 0 or n % 3 == 0: return False
+    stats = Instrumentation.ENABLED
+    if stats:
+        start = Instrumentation.clock()
     i = 5
-    while i * i <= n:
-        if n % i == 0 or n % (i + 2) == 0:
-            return False
-        i += 6
-    return True
+    try:
+        if n <= 1: return False
+        if n <= 3: return True
+        if n % 2 == 0 or n % 3 == 0: return False
+        while i * i <= n:
+            if n % i == 0 or n % (i + 2) == 0:
+                if stats:
+                    Instrumentation.count("is_prime.trial_divisions", 2)
+                return False
+            i += 6
+        return True
+    finally:
+        if stats:
+            # every full pass of the loop tried two divisors
+            Instrumentation.count("is_prime.trial_divisions", 2 * ((i - 5) // 6))
+            Instrumentation.observe("is_prime.n_bits", n.bit_length())
+            Instrumentation.record_time("is_prime", start)
 
 def modinv_euclid(a: int, m: int) -> int:
     m0, x0, x1 = m, 0, 1
@@ -35,11 +51,65 @@ def modinv_euclid(a: int, m: int) -> int:
         x0, x1 = x1 - q * x0, x0
     return x1 % m0
 
+@Memo.memoize("modinv", 2)
 def modinv(a: int, m: int) -> int:
-    if is_prime(m):
-        return pow(a, m - 2, m)
-    else:
-        return modinv_euclid(a, m)
+    stats = Instrumentation.ENABLED
+    if stats:
+        start = Instrumentation.clock()
+        Instrumentation.observe("modinv.m_bits", m.bit_length())
+    try:
+        if is_prime(m):
+            if stats:
+                Instrumentation.count("modinv.fermat")
+            return pow(a, m - 2, m)
+        else:
+            if stats:
+                Instrumentation.count("modinv.euclid")
+            return modinv_euclid(a, m)
+    finally:
+        if stats:
+            Instrumentation.record_time("modinv", start)
+
+def modinv_batch(values: list[int], m: int) -> list:
+    '''
+    Invert many numbers modulo the same m with ONE modular inversion (Montgomery's trick):
+
+        prefix[i] = a_0 * a_1 * ... * a_i mod m
+        inv       = prefix[-1] ^ (-1) mod m
+        walking back: a_i ^ (-1) = inv * prefix[i - 1],  then inv = inv * a_i
+
+    That is 3 multiplications per number instead of a full inversion (and primality test) each.
+    Only positive numbers coprime to m are part of the product. The others (a shared factor with m, or a <= 0)
+    go through modinv() one by one, so every entry is what modinv(a, m) gives for that number, and when
+    modinv() raises (e.g. ZeroDivisionError for 3 mod 9) the exception object is put in that number's slot
+    instead of failing the whole batch.
+    '''
+    results = [0] * len(values)
+    invertible = []
+    for i, a in enumerate(values):
+        if a > 0 and gcd(a, m) == 1:
+            invertible.append(i)
+        else:
+            try:
+                results[i] = modinv(a, m)
+            except Exception as e:
+                results[i] = e
+
+    prefix = []
+    acc = 1
+    for i in invertible:
+        acc = (acc * values[i]) % m
+        prefix.append(acc)
+    if not invertible:
+        return results
+
+    inv = pow(acc, -1, m)
+    for k in range(len(invertible) - 1, 0, -1):
+        i = invertible[k]
+        results[i] = (inv * prefix[k - 1]) % m
+        inv = (inv * values[i]) % m
+    results[invertible[0]] = inv % m
+    return results
 
 def main() -> None:
     a: int = int(input("to calculate the value of d in (a * d ≡ 1 mod m), Enter the value of a: "))
@@ -0,0 +1,339 @@
+'''
+Local asyncio service for modinv, tonelli_shanks, legendre_symbol and CRT, with request batching.
+
+Many clients can connect at the same time (Unix socket or localhost TCP) and send newline-delimited JSON requests,
+in the same format as BatchRunner.py:
+
+    {"id": 1, "op": "modinv", "a": 3, "m": 13}            ->  {"id": 1, "op": "modinv", "result": 9}
+    {"id": 2, "op": "sqrt", "a": 10, "p": 13}             ->  {"id": 2, "op": "sqrt", "result": 6}
+    {"id": 3, "op": "legendre", "a": 3, "p": 13}          ->  {"id": 3, "op": "legendre", "result": 1}
+    {"id": 4, "op": "crt", "a": [2, 3], "n": [5, 7]}      ->  {"id": 4, "op": "crt", "result": [17, 35]}
+    {"id": 5, "op": "stats"}                              ->  counters (see below)
+
+Responses carry the request "id"; a client may send several requests without waiting, and the answers can come
+back in a different order.
+
+MICRO-BATCHING
+Requests that use the same operation AND the same modulus are worth solving together:
+    - modinv:   one modular inversion for the whole batch (Montgomery's trick, modinv_batch)
+    - sqrt:     the non-residue search of Tonelli-Shanks is done once (tonelli_shanks_batch)
+    - legendre: the exponent (p - 1) / 2 is shared (legendre_symbol_batch)
+    - crt:      the CRT basis for the moduli is computed once (crt_batch)
+So the scheduler keeps one queue per (op, modulus). A queue is flushed when it reaches --max-batch requests, or
+--window milliseconds after its first request arrived, whichever comes first. The batch then runs in a process
+pool, so the event loop keeps accepting requests while the CPU work happens. A modinv batch reports a number it
+can't invert in that number's own slot, so only that request gets an error. If any other batch fails, its requests
+are retried one by one so only the bad request gets an error. Requests that can't be solved at all (sqrt or
+legendre with an even p or p < 3, crt with a and n of different lengths) get an error before they are queued.
+
+COUNTERS ("stats" op, and printed when the server stops)
+    requests, responses, errors, batches, mean/max batch size, throughput (responses/s since start),
+    latency p50/p90/p99/max in ms over the last 10000 requests.
+
+Usage:
+    python ModularService.py serve --port 8765 --workers 4
+    python ModularService.py serve --unix /tmp/modular.sock
+    python ModularService.py load --port 8765 --clients 50 --requests 200 --op modinv
+'''
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import cryptocodes
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+# --- work done in the process pool (module-level so it can be pickled) ---
+
+def _modulus_of(op: str, request: dict):
+    if op == "modinv":
+        return request["m"]
+    if op in ("sqrt", "legendre"):
+        return request["p"]
+    return tuple(request["n"])
+
+def check_request(op: str, value, modulus) -> None:
+    '''Reject a request that can't be solved before it is queued, so it can't hold up or break a batch.'''
+    if op in ("sqrt", "legendre"):
+        if not isinstance(modulus, int) or modulus < 3 or modulus % 2 == 0:
+            raise ValueError(f"p must be an odd prime, got {modulus!r}")
+    elif op == "crt":
+        if len(value) != len(modulus):
+            raise ValueError(f"{len(value)} remainders for {len(modulus)} moduli")
+
+def run_batch(op: str, values: list, modulus) -> list:
+    if op == "modinv":
+        return cryptocodes.modinv_batch(values, modulus)
+    if op == "sqrt":
+        return cryptocodes.tonelli_shanks_batch(values, modulus)
+    if op == "legendre":
+        return cryptocodes.legendre_symbol_batch(values, modulus)
+    if op == "crt":
+        return [list(r) for r in cryptocodes.crt_batch(values, list(modulus))]
+    raise ValueError(f"Unknown op: {op!r}")
+
+def run_each(op: str, values: list, modulus) -> list:
+    '''Fallback after a failed batch: (ok, result or error message) for every value on its own.'''
+    out = []
+    for value in values:
+        try:
+            out.append((True, run_batch(op, [value], modulus)[0]))
+        except Exception as e:
+            out.append((False, f"{type(e).__name__}: {e}"))
+    return out
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.requests = 0
+        self.responses = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched = 0
+        self.max_batch = 0
+        self.latencies = deque(maxlen=10000)
+
+    def snapshot(self) -> dict:
+        uptime = time.perf_counter() - self.start
+        lat = sorted(self.latencies)
+
+        def pct(q):
+            return round(lat[min(len(lat) - 1, int(q * len(lat)))] * 1000, 3) if lat else None
+
+        return {
+            "uptime_s": round(uptime, 3),
+            "requests": self.requests,
+            "responses": self.responses,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch": round(self.batched / self.batches, 2) if self.batches else 0,
+            "max_batch": self.max_batch,
+            "throughput_rps": round(self.responses / uptime, 1) if uptime else 0,
+            "latency_ms": {"p50": pct(0.5), "p90": pct(0.9), "p99": pct(0.99), "max": pct(1.0)},
+        }
+
+
+class BatchScheduler:
+    '''Collects requests per (op, modulus) and runs each group as one batch in the executor.'''
+
+    def __init__(self, executor, window: float, max_batch: int, stats: Stats) -> None:
+        self.executor = executor
+        self.window = window
+        self.max_batch = max_batch
+        self.stats = stats
+        self.pending = {}    # (op, modulus) -> list of (value, future)
+        self.timers = {}
+
+    async def submit(self, op: str, request: dict) -> tuple[bool, object]:
+        '''Queue one request; resolves to (True, result) or (False, error message).'''
+        value = request["a"]
+        modulus = _modulus_of(op, request)
+        check_request(op, value, modulus)
+
+        key = (op, modulus)
+        future = asyncio.get_running_loop().create_future()
+        queue = self.pending.setdefault(key, [])
+        queue.append((value, future))
+
+        if len(queue) >= self.max_batch:
+            self._flush(key)
+        elif key not in self.timers:
+            self.timers[key] = asyncio.get_running_loop().call_later(self.window, self._flush, key)
+        return await future
+
+    def _flush(self, key) -> None:
+        timer = self.timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        queue = self.pending.pop(key, None)
+        if queue:
+            asyncio.get_running_loop().create_task(self._run(key, queue))
+
+    async def _run(self, key, queue) -> None:
+        op, modulus = key
+        values = [value for value, _ in queue]
+        futures = [future for _, future in queue]
+        loop = asyncio.get_running_loop()
+
+        self.stats.batches += 1
+        self.stats.batched += len(queue)
+        self.stats.max_batch = max(self.stats.max_batch, len(queue))
+
+        try:
+            results = await loop.run_in_executor(self.executor, run_batch, op, values, modulus)
+            # modinv_batch puts the exception of a number it can't invert in that number's slot
+            outcomes = [(False, f"{type(r).__name__}: {r}") if isinstance(r, Exception) else (True, r)
+                        for r in results]
+        except Exception:
+            try:
+                outcomes = await loop.run_in_executor(self.executor, run_each, op, values, modulus)
+            except Exception as e:
+                # e.g. BrokenProcessPool: nothing more to try, but every client still gets an answer
+                outcomes = [(False, f"{type(e).__name__}: {e}")] * len(futures)
+
+        for future, outcome in zip(futures, outcomes):
+            if not future.done():
+                future.set_result(outcome)
+
+
+class ModularServer:
+    OPS = ("modinv", "sqrt", "legendre", "crt")
+
+    def __init__(self, workers: int = None, window_ms: float = 2.0, max_batch: int = 256) -> None:
+        self.executor = ProcessPoolExecutor(workers) if workers != 0 else None
+        self.stats = Stats()
+        self.scheduler = BatchScheduler(self.executor, window_ms / 1000, max_batch, self.stats)
+
+    async def handle_request(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        start = time.perf_counter()
+        request_id, op = None, None
+        try:
+            request = json.loads(line)
+            request_id, op = request.get("id"), request.get("op")
+            if op == "stats":
+                out = {"id": request_id, "op": op, "result": self.stats.snapshot()}
+            elif op in self.OPS:
+                ok, value = await self.scheduler.submit(op, request)
+                out = {"id": request_id, "op": op, "result" if ok else "error": value}
+            else:
+                raise ValueError(f"Unknown op: {op!r}")
+        except Exception as e:
+            out = {"id": request_id, "op": op, "error": f"{type(e).__name__}: {e}"}
+        if "error" in out:
+            self.stats.errors += 1
+
+        self.stats.responses += 1
+        self.stats.latencies.append(time.perf_counter() - start)
+        if not writer.is_closing():
+            writer.write((json.dumps(out) + "\n").encode())
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                self.stats.requests += 1
+                task = asyncio.create_task(self.handle_request(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                await writer.drain()
+            if tasks:
+                await asyncio.gather(*tasks)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: str = None) -> None:
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_client, path=unix_path)
+            where = unix_path
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+            where = f"{host}:{port}"
+        print(f"Serving on {where}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+            print(json.dumps(self.stats.snapshot(), indent=2))
+
+
+# --- load generator ---
+
+def make_request(op: str, rng: random.Random, modulus: int, request_id: int) -> dict:
+    if op == "crt":
+        moduli = [3, 5, 7, 11, 13, 17, 19, 23]
+        return {"id": request_id, "op": op, "a": [rng.randrange(n) for n in moduli], "n": moduli}
+    if op == "modinv":
+        return {"id": request_id, "op": op, "a": rng.randrange(1, modulus), "m": modulus}
+    return {"id": request_id, "op": op, "a": rng.randrange(1, modulus), "p": modulus}
+
+
+async def _client(args, client_id: int, latencies: list, errors: list) -> None:
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    rng = random.Random(client_id)
+    for i in range(args.requests):
+        request = make_request(args.op, rng, args.modulus, client_id * args.requests + i)
+        start = time.perf_counter()
+        writer.write((json.dumps(request) + "\n").encode())
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if "error" in response:
+            errors.append(response["error"])
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_load(args) -> None:
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(args, c, latencies, errors) for c in range(args.clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"{total} requests from {args.clients} clients in {elapsed:.3f} s ({total / elapsed:.0f} req/s), "
+          f"{len(errors)} errors")
+    for q in (0.5, 0.9, 0.99):
+        print(f"  p{int(q * 100):<3} {latencies[min(total - 1, int(q * total))] * 1000:8.3f} ms")
+
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    writer.write(b'{"op": "stats"}\n')
+    await writer.drain()
+    print("server stats:", json.dumps(json.loads(await reader.readline())["result"], indent=2))
+    writer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batched modular arithmetic service and load generator.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("serve", "load"):
+        p = sub.add_parser(name)
+        p.add_argument("--host", default=DEFAULT_HOST)
+        p.add_argument("--port", type=int, default=DEFAULT_PORT)
+        p.add_argument("--unix", help="Unix socket path (instead of TCP)")
+    serve = sub.choices["serve"]
+    serve.add_argument("--workers", type=int, default=os.cpu_count(),
+                       help="worker processes, 0 = threads in this process")
+    serve.add_argument("--window", type=float, default=2.0, help="batching window in ms")
+    serve.add_argument("--max-batch", type=int, default=256)
+    load = sub.choices["load"]
+    load.add_argument("--clients", type=int, default=50)
+    load.add_argument("--requests", type=int, default=200, help="requests per client")
+    load.add_argument("--op", choices=ModularServer.OPS, default="modinv")
+    load.add_argument("--modulus", type=int, default=1007621497415251)
+    args = parser.parse_args()
+
+    try:
+        if args.command == "serve":
+            server = ModularServer(args.workers, args.window, args.max_batch)
+            asyncio.run(server.serve(args.host, args.port, args.unix))
+        else:
+            asyncio.run(run_load(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -55,7 +55,6 @@ uint64_t mod_exp(uint64_t base, uint64_t exp, uint64_t mod) {
 
 // Euler's Criterion: returns true if x is quadratic residue mod p, else false
 bool is_quadratic_residue(uint64_t x, uint64_t p) {
-    if (x == 0) return true; // 0 is always a residue
     uint64_t res = mod_exp(x, (p - 1) / 2, p);
     return res == 1;
 }
@@ -63,11 +62,11 @@ bool is_quadratic_residue(uint64_t x, uint64_t p) {
 // Find two square roots of x mod p assuming x is quadratic residue
 // Returns true if roots found, false otherwise
 bool find_square_roots(uint64_t x, uint64_t p, uint64_t& root1, uint64_t& root2) {
-    for (uint64_t a = 0; a < p; a++) {
+    for (uint64_t a = 1; a < p; a++) {
         __uint128_t sq = (__uint128_t)a * a;
         if (static_cast<uint64_t>(sq % p) == x % p) {
             root1 = a;
-            root2 = (p - a) % p;
+            root2 = p - a;
             return true;
         }
     }
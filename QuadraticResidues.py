@@ -10,11 +10,15 @@ about half the elements in the set F_p^* (all integers from 1 to p - 1), and che
 them can be done by brute force when p is small.
 '''
 
-def is_quadratic_residue(x, p):
+from ModContext import ModContext
+
+def is_quadratic_residue(x, p, ctx: ModContext = None):
     """
     Check if x is a quadratic residue modulo p using Euler's Criterion.
     Returns True if residue, False otherwise.
     """
+    if ctx is not None:
+        return ctx.pow(ctx.enter(x), (p - 1) // 2) == ctx.one
     return pow(x, (p - 1) // 2, p) == 1
 
 def find_square_roots(x, p):
@@ -16,6 +16,29 @@ def XOR(message, key):
         result += chr(ord(char) ^ key)
     return result
 
+def xor_bytes(*args) -> bytes:
+    '''
+    XOR any number of byte strings together, repeating the shorter ones to the length of the longest.
+    An int counts as a single byte and a str is encoded as UTF-8, so this works like pwntools' xor()
+    without having to import pwntools (which takes seconds).
+    '''
+    parts = []
+    for arg in args:
+        if isinstance(arg, int):
+            arg = bytes([arg])
+        elif isinstance(arg, str):
+            arg = arg.encode()
+        if not arg:
+            raise ValueError("Cannot XOR with an empty value.")
+        parts.append(bytes(arg))
+
+    length = max(len(part) for part in parts)
+    result = 0
+    for part in parts:
+        repeated = (part * (length // len(part) + 1))[:length]
+        result ^= int.from_bytes(repeated, 'big')
+    return result.to_bytes(length, 'big')
+
 def main():
     plaintext = 'Hello, World!'
     key = 13
@@ -16,13 +16,27 @@ FLAG ^ KEY1 ^ KEY3 ^ KEY2 = 04ee9855208a2cd59091d04767ae47963170d1660df7f56f5faf
 NB, Before you XOR these objects, be sure to decode from hex to bytes.
 '''
 
-from pwn import xor
-
-key1 = bytes.fromhex("a6c8b6733c9b22de7bc0253266a3867df55acde8635e19c73313")
-key2 = xor(bytes.fromhex("37dcb292030faa90d07eec17e3b1c6d8daf94c35d4c9191a5e1e"), key1)
-key3 = xor(bytes.fromhex("c1545756687e7573db23aa1c3452a098b71a7fbf0fddddde5fc1"), key2)
-flag = xor(xor(bytes.fromhex("04ee9855208a2cd59091d04767ae47963170d1660df7f56f5faf"), key1), bytes.fromhex("c1545756687e7573db23aa1c3452a098b71a7fbf0fddddde5fc1")) 
-print(key1)
-print(key2)
-print(key3)
-print(flag)
\ No newline at end of file
+from XOR import xor_bytes as xor
+
+KEY1 = "a6c8b6733c9b22de7bc0253266a3867df55acde8635e19c73313"
+KEY2_KEY1 = "37dcb292030faa90d07eec17e3b1c6d8daf94c35d4c9191a5e1e"
+KEY2_KEY3 = "c1545756687e7573db23aa1c3452a098b71a7fbf0fddddde5fc1"
+FLAG_KEY1_KEY3_KEY2 = "04ee9855208a2cd59091d04767ae47963170d1660df7f56f5faf"
+
+def recover_flag() -> tuple[bytes, bytes, bytes, bytes]:
+    key1 = bytes.fromhex(KEY1)
+    key2 = xor(bytes.fromhex(KEY2_KEY1), key1)
+    key3 = xor(bytes.fromhex(KEY2_KEY3), key2)
+    flag = xor(xor(bytes.fromhex(FLAG_KEY1_KEY3_KEY2), key1), bytes.fromhex(KEY2_KEY3))
+    return key1, key2, key3, flag
+
+def main() -> None:
+    key1, key2, key3, flag = recover_flag()
+    print(key1)
+    print(key2)
+    print(key3)
+    print(flag)
+
+
+if __name__ == '__main__':
+    main()
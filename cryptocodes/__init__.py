@@ -0,0 +1,135 @@
+'''
+Every algorithm in this repo, importable as one package:
+
+        import cryptocodes
+        cryptocodes.tonelli_shanks(10, 13)
+        cryptocodes.crt_stepwise([2, 3], [5, 7])
+        cryptocodes.ModularSquareRoot          # the Modular-Square-Root.py module itself
+
+The scripts at the top of the repo stay exactly where they are (so `python ExtendedGCD.py` still works); this
+package only knows how to load them. Some of them can't be imported normally because of their file names
+(`Modular-Square-Root.py`, `Bytes&BigIntegers.py`, ...), so they get a clean module name here.
+
+Nothing is loaded at `import cryptocodes`. A module is executed the first time one of its names is used, and
+then cached, so heavy dependencies like NumPy (ModularArrays) or ctypes (CryptoKernels) are only paid for by
+the code that uses them. `python -m cryptocodes` checks the import-time budget.
+'''
+
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module name -> file, relative to the repo root
+_MODULES = {
+    "ASCII2Char": "ASCII2Char.py",
+    "Base64": "Base64.py",
+    "BytesBigIntegers": "Bytes&BigIntegers.py",
+    "ChineseRemainderTheorem": "ChineseRemainderTheorem.py",
+    "CryptoKernels": "CryptoKernels.py",
+    "EuclideanAlgorithm": "EuclideanAlgorithm.py",
+    "ExtendedGCD": "ExtendedGCD.py",
+    "HEX2ASCII": "HEX2ASCII.py",
+    "Instrumentation": "Instrumentation.py",
+    "IntArrayFile": "IntArrayFile.py",
+    "LegendreSymbol": "LegendreSymbol.py",
+    "Memo": "Memo.py",
+    "ModContext": "ModContext.py",
+    "ModularArithmetic1": "ModularArithmetic1.py",
+    "ModularArithmetic2": "ModularArithmetic2.py",
+    "ModularArrays": "ModularArrays.py",
+    "ModularInverting_MultiplicativeInverse": "ModularInverting_MultiplicativeInverse.py",
+    "ModularSquareRoot": "Modular-Square-Root.py",
+    "QuadraticResidues": "QuadraticResidues.py",
+    "XOR": "XOR.py",
+    "XORProperties": "XORProperties.py",
+    "num2letter": "num2letter.py",
+    "AdriensSigns": os.path.join("Modular Arithmetic", "Adrien's_Signs.py"),
+    "AdriensSignsSolution": os.path.join("Modular Arithmetic", "Adrien's_SignsSolution.py"),
+    "FavouriteByte": os.path.join("Introduction to CryptoHack Challenges", "FavouriteByte.py"),
+    "YouEitherKnowXOR": os.path.join("Introduction to CryptoHack Challenges", "You either know, XOR you don't.py"),
+}
+
+# function/class name -> module that defines it
+# (names defined in several modules, like encode/decode, are only reachable through their module;
+#  when a function is named like its module - XOR, ModContext, num2letter - the function wins, use load_module)
+_EXPORTS = {
+    "message2Number": "BytesBigIntegers",
+    "number2Message": "BytesBigIntegers",
+    "combine_congruences": "ChineseRemainderTheorem",
+    "crt_stepwise": "ChineseRemainderTheorem",
+    "crt_batch": "ChineseRemainderTheorem",
+    "GCDRecursive": "EuclideanAlgorithm",
+    "GCDWhileLoop": "EuclideanAlgorithm",
+    "extendedGCD": "ExtendedGCD",
+    "legendre_symbol": "LegendreSymbol",
+    "modular_sqrt": "LegendreSymbol",
+    "find_first_residue_sqrt": "LegendreSymbol",
+    "legendre_symbol_batch": "LegendreSymbol",
+    "ModContext": "ModContext",
+    "moduloCalc": "ModularArithmetic1",
+    "mod_exp": "ModularArithmetic2",
+    "mulmod": "ModularArrays",
+    "reduce_array": "ModularArrays",
+    "mod_exp_array": "ModularArrays",
+    "legendre_symbol_array": "ModularArrays",
+    "modinv_array": "ModularArrays",
+    "modinv_euclid_array": "ModularArrays",
+    "is_prime": "ModularInverting_MultiplicativeInverse",
+    "modinv": "ModularInverting_MultiplicativeInverse",
+    "modinv_euclid": "ModularInverting_MultiplicativeInverse",
+    "modinv_batch": "ModularInverting_MultiplicativeInverse",
+    "tonelli_shanks": "ModularSquareRoot",
+    "tonelli_setup": "ModularSquareRoot",
+    "tonelli_shanks_batch": "ModularSquareRoot",
+    "is_quadratic_residue": "QuadraticResidues",
+    "find_square_roots": "QuadraticResidues",
+    "XOR": "XOR",
+    "xor_bytes": "XOR",
+    "recover_flag": "XORProperties",
+    "num2letter": "num2letter",
+    "encrypt_flag": "AdriensSigns",
+    "decrypt_flag": "AdriensSignsSolution",
+    "brute_force": "FavouriteByte",
+}
+
+__all__ = sorted(set(_MODULES) | set(_EXPORTS))
+
+
+def load_module(name: str):
+    '''Execute (once) and return the repo module registered as `name`.'''
+    module = sys.modules.get(name)
+    path = os.path.join(_ROOT, _MODULES[name])
+    if module is not None and os.path.abspath(getattr(module, "__file__", "") or "") == path:
+        return module
+
+    import importlib.util   # not at the top: it drags in contextlib and would triple the package import time
+
+    # the scripts import each other by plain name (from ExtendedGCD import extendedGCD)
+    if _ROOT not in sys.path:
+        sys.path.append(_ROOT)
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(load_module(_EXPORTS[name]), name)
+    elif name in _MODULES:
+        value = load_module(name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,56 @@
+'''
+python -m cryptocodes
+
+Checks the import-time budget of the package: `import cryptocodes` must stay cheap, because batch workers import
+it once per process and then only pay for function calls. Each measurement runs in a fresh interpreter and the
+best of a few runs is kept. The first-use cost of every module is printed too, so you can see what a lazy load
+costs. Exits with status 1 when the package import is over budget.
+'''
+
+import subprocess
+import sys
+
+import cryptocodes
+
+IMPORT_BUDGET_MS = 5.0
+RUNS = 5
+
+_SNIPPET = '''
+import time
+start = time.perf_counter()
+import cryptocodes
+{extra}
+print((time.perf_counter() - start) * 1000)
+'''
+
+
+def measure(extra: str = "") -> float:
+    '''Best-of-RUNS wall time (ms) of `import cryptocodes` plus `extra`, each run in a new interpreter.'''
+    times = []
+    for _ in range(RUNS):
+        out = subprocess.run([sys.executable, "-c", _SNIPPET.format(extra=extra)],
+                             capture_output=True, text=True, check=True, cwd=cryptocodes._ROOT)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return min(times)
+
+
+def main() -> None:
+    base = measure()
+    print(f"import cryptocodes: {base:.2f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+
+    print("\nfirst use of each module (including the package import):")
+    for name in sorted(cryptocodes._MODULES):
+        try:
+            ms = measure(f"cryptocodes.load_module({name!r})")
+            print(f"  {name:<40} {ms:8.2f} ms")
+        except subprocess.CalledProcessError as e:
+            reason = (e.stderr.strip().splitlines() or ["failed"])[-1]
+            print(f"  {name:<40} unavailable ({reason})")
+
+    if base > IMPORT_BUDGET_MS:
+        print(f"\nOVER BUDGET: {base:.2f} ms > {IMPORT_BUDGET_MS:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,10 @@
-nums = [16,9,3,15,3,20,6,20,8,5,14,21,13,2,5,18,19,13,1,19,15,14]
-print(''.join([chr(n + 64) for n in nums]))
\ No newline at end of file
+def num2letter(nums: list[int]) -> str:
+    return ''.join([chr(n + 64) for n in nums])
+
+def main() -> None:
+    nums = [16,9,3,15,3,20,6,20,8,5,14,21,13,2,5,18,19,13,1,19,15,14]
+    print(num2letter(nums))
+
+
+if __name__ == '__main__':
+    main()